@@ -2,11 +2,18 @@
 
 __version__ = "1.0.0"
 
-from .analyzer import analyze_code, detect_language, SUPPORTED_LANGUAGES
-
 __all__ = [
     "analyze_code",
     "detect_language",
     "SUPPORTED_LANGUAGES",
     "__version__",
 ]
+
+
+def __getattr__(name):
+    # Load the analyzer (and every language module behind it) on first use, so the CLI can
+    # answer --help/--version without importing it.
+    if name in ("analyze_code", "detect_language", "SUPPORTED_LANGUAGES"):
+        from . import analyzer
+        return getattr(analyzer, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
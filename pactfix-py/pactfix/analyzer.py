@@ -1,9 +1,13 @@
 """Multi-language code and config file analyzer."""
 
 import ast
+import functools
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 from pathlib import Path
 
 SUPPORTED_LANGUAGES = [
@@ -52,92 +56,114 @@ class AnalysisResult:
             'context': self.context
         }
 
-
-def detect_language(code: str, filename: str = None) -> str:
-    """Detect the language/format of the code."""
-    lines = code.strip().split('\n')
-    first_line = lines[0] if lines else ''
-    
-    if filename:
-        fn_lower = filename.lower()
-        fn_name = Path(filename).name.lower()
-        
-        if fn_name == 'dockerfile' or fn_lower.endswith('/dockerfile'):
-            return 'dockerfile'
-        if any(fn_lower.endswith(x) for x in ['docker-compose.yml', 'docker-compose.yaml', 'compose.yml', 'compose.yaml']):
-            return 'docker-compose'
-        if fn_lower.endswith('.tf'):
-            return 'terraform'
-        if fn_lower.endswith('.sql'):
-            return 'sql'
-        if fn_lower.endswith('nginx.conf') or '.nginx' in fn_lower:
-            return 'nginx'
-        if fn_lower.endswith(('.yml', '.yaml')) and ('workflow' in fn_lower or '.github' in fn_lower):
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AnalysisResult':
+        """Rebuild a result from to_dict() output."""
+        return cls(
+            language=data['language'],
+            original_code=data['originalCode'],
+            fixed_code=data['fixedCode'],
+            errors=[Issue(**e) for e in data['errors']],
+            warnings=[Issue(**w) for w in data['warnings']],
+            fixes=[Fix(**{k: v for k, v in f.items() if k != 'message'}) for f in data['fixes']],
+            context=data.get('context', {}),
+        )
+
+
+@functools.lru_cache(maxsize=8192)
+def _language_from_filename(filename: str) -> Optional[str]:
+    """Language implied by the file name alone, or None when the content has to decide."""
+    fn_lower = filename.lower()
+    fn_name = Path(filename).name.lower()
+
+    if fn_name == 'dockerfile' or fn_lower.endswith('/dockerfile'):
+        return 'dockerfile'
+    if any(fn_lower.endswith(x) for x in ['docker-compose.yml', 'docker-compose.yaml', 'compose.yml', 'compose.yaml']):
+        return 'docker-compose'
+    if fn_lower.endswith('.tf'):
+        return 'terraform'
+    if fn_lower.endswith('.sql'):
+        return 'sql'
+    if fn_lower.endswith('nginx.conf') or '.nginx' in fn_lower:
+        return 'nginx'
+    if fn_lower.endswith(('.yml', '.yaml')) and ('workflow' in fn_lower or '.github' in fn_lower):
+        return 'github-actions'
+    if fn_name in ('.gitlab-ci.yml', '.gitlab-ci.yaml'):
+        return 'gitlab-ci'
+    if any(x in fn_lower for x in ['playbook', 'ansible']):
+        return 'ansible'
+    if fn_name in ('chart.yaml', 'chart.yml', 'values.yaml', 'values.yml'):
+        return 'helm'
+    if '/templates/' in fn_lower and fn_lower.endswith(('.yml', '.yaml')):
+        return 'helm'
+    if fn_lower.endswith(('.tpl', '.gotmpl')):
+        return 'helm'
+    if fn_lower.endswith('.py'):
+        return 'python'
+    if fn_lower.endswith('.php'):
+        return 'php'
+    if fn_lower.endswith('.js'):
+        return 'javascript'  # detect_language upgrades this to nodejs by content
+    if fn_lower.endswith('.sh'):
+        return 'bash'
+    if fn_lower.endswith('.ts') or fn_lower.endswith('.tsx'):
+        return 'typescript'
+    if fn_lower.endswith('.go'):
+        return 'go'
+    if fn_lower.endswith('.rs'):
+        return 'rust'
+    if fn_lower.endswith('.java'):
+        return 'java'
+    if fn_lower.endswith('.cs'):
+        return 'csharp'
+    if fn_lower.endswith('.rb'):
+        return 'ruby'
+    if fn_lower.endswith('.json') or fn_lower.endswith('.jsonc'):
+        return 'json'
+    if fn_lower.endswith('.toml'):
+        return 'toml'
+    if fn_lower.endswith('.ini') or fn_lower.endswith('.cfg'):
+        return 'ini'
+    if fn_name == 'makefile' or fn_lower.endswith('.mk'):
+        return 'makefile'
+    if fn_lower.endswith('.html') or fn_lower.endswith('.htm'):
+        return 'html'
+    if fn_lower.endswith('.css'):
+        return 'css'
+    if fn_lower.endswith('.conf') and 'apache' in fn_lower:
+        return 'apache'
+    if fn_lower.endswith('.service') or fn_lower.endswith('.timer'):
+        return 'systemd'
+    if fn_name == 'jenkinsfile':
+        return 'jenkinsfile'
+    if fn_lower.endswith(('.yml', '.yaml')):
+        # Check for specific YAML types first
+        if 'workflow' in fn_lower or '.github' in fn_lower:
             return 'github-actions'
         if fn_name in ('.gitlab-ci.yml', '.gitlab-ci.yaml'):
             return 'gitlab-ci'
-        if any(x in fn_lower for x in ['playbook', 'ansible']):
-            return 'ansible'
         if fn_name in ('chart.yaml', 'chart.yml', 'values.yaml', 'values.yml'):
             return 'helm'
-        if '/templates/' in fn_lower and fn_lower.endswith(('.yml', '.yaml')):
-            return 'helm'
-        if fn_lower.endswith(('.tpl', '.gotmpl')):
+        if '/templates/' in fn_lower:
             return 'helm'
-        if fn_lower.endswith('.py'):
-            return 'python'
-        if fn_lower.endswith('.php'):
-            return 'php'
-        if fn_lower.endswith('.js'):
-            if 'require(' in code or 'module.exports' in code:
-                return 'nodejs'
-            return 'javascript'
-        if fn_lower.endswith('.sh'):
-            return 'bash'
-        if fn_lower.endswith('.ts') or fn_lower.endswith('.tsx'):
-            return 'typescript'
-        if fn_lower.endswith('.go'):
-            return 'go'
-        if fn_lower.endswith('.rs'):
-            return 'rust'
-        if fn_lower.endswith('.java'):
-            return 'java'
-        if fn_lower.endswith('.cs'):
-            return 'csharp'
-        if fn_lower.endswith('.rb'):
-            return 'ruby'
-        if fn_lower.endswith('.json') or fn_lower.endswith('.jsonc'):
-            return 'json'
-        if fn_lower.endswith('.toml'):
-            return 'toml'
-        if fn_lower.endswith('.ini') or fn_lower.endswith('.cfg'):
-            return 'ini'
-        if fn_name == 'makefile' or fn_lower.endswith('.mk'):
-            return 'makefile'
-        if fn_lower.endswith('.html') or fn_lower.endswith('.htm'):
-            return 'html'
-        if fn_lower.endswith('.css'):
-            return 'css'
-        if fn_lower.endswith('.conf') and 'apache' in fn_lower:
-            return 'apache'
-        if fn_lower.endswith('.service') or fn_lower.endswith('.timer'):
-            return 'systemd'
-        if fn_name == 'jenkinsfile':
-            return 'jenkinsfile'
-        if fn_lower.endswith(('.yml', '.yaml')):
-            # Check for specific YAML types first
-            if 'workflow' in fn_lower or '.github' in fn_lower:
-                return 'github-actions'
-            if fn_name in ('.gitlab-ci.yml', '.gitlab-ci.yaml'):
-                return 'gitlab-ci'
-            if fn_name in ('chart.yaml', 'chart.yml', 'values.yaml', 'values.yml'):
-                return 'helm'
-            if '/templates/' in fn_lower:
-                return 'helm'
-            # Check for Kubernetes patterns in filename
-            if any(x in fn_lower for x in ['deployment', 'service', 'configmap', 'secret', 'ingress', 'statefulset', 'daemonset', 'cronjob']):
-                return 'kubernetes'
-            return 'yaml'
+        # Check for Kubernetes patterns in filename
+        if any(x in fn_lower for x in ['deployment', 'service', 'configmap', 'secret', 'ingress', 'statefulset', 'daemonset', 'cronjob']):
+            return 'kubernetes'
+        return 'yaml'
+    return None
+
+
+def detect_language(code: str, filename: str = None) -> str:
+    """Detect the language/format of the code."""
+    if filename:
+        language = _language_from_filename(filename)
+        if language == 'javascript' and ('require(' in code or 'module.exports' in code):
+            return 'nodejs'
+        if language is not None:
+            return language
+
+    lines = code.strip().split('\n')
+    first_line = lines[0] if lines else ''
 
     # Content-based detection
     if any(line.strip().upper().startswith(('FROM ', 'RUN ', 'COPY ', 'ENTRYPOINT ')) for line in lines[:20]):
@@ -382,6 +408,13 @@ def _apply_edits_to_lines(lines: List[str], edits: List[Dict[str, Any]]) -> List
     return out
 
 
+def _join_fixed_lines(code: str, fixed_lines: Iterable[str], fixes: List[Fix]) -> str:
+    """Join fixed lines back into code; unchanged input is returned as-is."""
+    if not fixes:
+        return code
+    return '\n'.join(fixed_lines)
+
+
 def _brace_unbraced_bash_vars(line: str) -> str:
     out = []
     i = 0
@@ -524,7 +557,7 @@ def analyze_bash(code: str) -> AnalysisResult:
         
         fixed_lines[i-1] = current_line
     
-    return AnalysisResult('bash', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('bash', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
 
 
 def analyze_python(code: str) -> AnalysisResult:
@@ -735,7 +768,7 @@ def analyze_python(code: str) -> AnalysisResult:
     except Exception:
         pass
 
-    return AnalysisResult('python', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('python', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
 
 
 def analyze_php(code: str) -> AnalysisResult:
@@ -802,7 +835,7 @@ def analyze_javascript(code: str, is_nodejs: bool = False) -> AnalysisResult:
             if re.search(r'\b(readFileSync|writeFileSync)\b', stripped):
                 warnings.append(Issue(i, 1, 'NODE002', 'Sync I/O blokuje event loop - użyj async'))
     
-    return AnalysisResult(lang, code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult(lang, code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
 
 
 def analyze_dockerfile(code: str) -> AnalysisResult:
@@ -872,7 +905,7 @@ def analyze_dockerfile(code: str) -> AnalysisResult:
         warnings.append(Issue(1, 1, 'DOCKER010', 'Brak HEALTHCHECK'))
     
     context = {'base_image': base_image, 'env_vars': list(env_vars)}
-    return AnalysisResult('dockerfile', code, '\n'.join(fixed_lines), errors, warnings, fixes, context)
+    return AnalysisResult('dockerfile', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes, context)
 
 
 def analyze_docker_compose(code: str) -> AnalysisResult:
@@ -970,7 +1003,7 @@ def analyze_sql(code: str) -> AnalysisResult:
     
     missing = tables_referenced - tables_created - {'dual', 'information_schema'}
     context = {'tables_created': list(tables_created), 'tables_referenced': list(tables_referenced), 'potentially_missing': list(missing)}
-    return AnalysisResult('sql', code, '\n'.join(fixed_lines), errors, warnings, fixes, context)
+    return AnalysisResult('sql', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes, context)
 
 
 def analyze_terraform(code: str) -> AnalysisResult:
@@ -1244,7 +1277,7 @@ def analyze_nginx(code: str) -> AnalysisResult:
             fixed_lines.insert(insert_at + k, nl)
         fixes.append(Fix(line_no, 'Dodano ustawienia hardening', '', new_lines[0].strip()))
 
-    return AnalysisResult('nginx', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('nginx', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
 
 
 
@@ -1276,7 +1309,7 @@ def analyze_github_actions(code: str) -> AnalysisResult:
         if stripped.startswith('jobs:'):
             warnings.append(Issue(i, 1, 'GHA005', 'Ustaw minimalne permissions'))
     
-    return AnalysisResult('github-actions', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('github-actions', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
 
 
 def analyze_ansible(code: str) -> AnalysisResult:
@@ -1332,9 +1365,31 @@ except ImportError:
     NEW_ANALYZERS_AVAILABLE = False
 
 
+# Recent results keyed by (language, content digest); analyzers are pure functions of their input.
+_RESULT_CACHE: "OrderedDict[tuple, AnalysisResult]" = OrderedDict()
+_RESULT_CACHE_SIZE = 128
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _copy_result(result: AnalysisResult) -> AnalysisResult:
+    """Shallow copy so callers can mutate a result without touching the cached one."""
+    return AnalysisResult(
+        result.language, result.original_code, result.fixed_code,
+        list(result.errors), list(result.warnings), list(result.fixes), dict(result.context),
+    )
+
+
 def analyze_code(code: str, filename: str = None, force_language: str = None) -> AnalysisResult:
     """Main entry point for code analysis."""
     language = force_language or detect_language(code, filename)
+
+    key = (language, hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=16).digest())
+    with _RESULT_CACHE_LOCK:
+        cached = _RESULT_CACHE.get(key)
+        if cached is not None:
+            _RESULT_CACHE.move_to_end(key)
+    if cached is not None:
+        return _copy_result(cached)
     
     analyzers = {
         'bash': analyze_bash,
@@ -1378,4 +1433,9 @@ def analyze_code(code: str, filename: str = None, force_language: str = None) ->
     analyzer = analyzers.get(language, analyze_bash)
     result = analyzer(code)
     result.language = language
+
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[key] = _copy_result(result)
+        if len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
     return result
@@ -2,7 +2,9 @@
 
 import re
 from typing import List
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+
+_WEAK_CIPHERS = ('RC4', 'MD5', 'DES', 'EXPORT', 'NULL')
 
 
 def analyze_apache(code: str) -> AnalysisResult:
@@ -81,8 +83,7 @@ def analyze_apache(code: str) -> AnalysisResult:
         # APACHE008: Weak ciphers
         if 'SSLCipherSuite' in stripped:
             upper = stripped.upper()
-            weak_ciphers = ['RC4', 'MD5', 'DES', 'EXPORT', 'NULL']
-            if any(c in upper for c in weak_ciphers):
+            if any(c in upper for c in _WEAK_CIPHERS):
                 errors.append(Issue(i, 1, 'APACHE008', 'Słabe szyfry w SSLCipherSuite'))
                 fixed = 'SSLCipherSuite HIGH:!aNULL:!MD5:!3DES:!RC4'
                 fixes.append(Fix(i, 'Ustawiono bezpieczne SSLCipherSuite', stripped, fixed))
@@ -143,8 +144,7 @@ def analyze_apache(code: str) -> AnalysisResult:
         if stripped.startswith('<Directory'):
             in_directory = True
             dir_start_idx = idx
-            indent_match = re.match(r'^\s*', line)
-            dir_indent = indent_match.group(0) if indent_match else ''
+            dir_indent = line[:len(line) - len(line.lstrip())]
             continue
         if in_directory and stripped.startswith('</Directory'):
             block = '\n'.join(fixed_lines[dir_start_idx:idx+1]) if dir_start_idx is not None else ''
@@ -162,8 +162,7 @@ def analyze_apache(code: str) -> AnalysisResult:
         stripped = line.strip()
         if stripped.lower().startswith('<virtualhost') and ':443' in stripped:
             in_ssl_vhost = True
-            indent_match = re.match(r'^\s*', line)
-            ssl_vhost_indent = indent_match.group(0) if indent_match else ''
+            ssl_vhost_indent = line[:len(line) - len(line.lstrip())]
             continue
         if in_ssl_vhost and stripped.lower().startswith('</virtualhost'):
             block = '\n'.join(fixed_lines[max(0, idx-80):idx+1])
@@ -184,4 +183,4 @@ def analyze_apache(code: str) -> AnalysisResult:
             in_ssl_vhost = False
             ssl_vhost_indent = ''
 
-    return AnalysisResult('apache', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('apache', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
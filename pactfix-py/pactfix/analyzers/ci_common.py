@@ -0,0 +1,100 @@
+"""Per-line checks shared by the CI pipeline analyzers (GitLab CI, Jenkinsfile)."""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Match, Optional, Pattern, Tuple
+
+from ..analyzer import Issue, Fix
+
+_RE_SHELL = re.compile(r'\b(bash|sh)\b')
+_RE_CURL_BASH = re.compile(r"curl\s+([^|]+)\|\s*bash")
+# One pass over the line tells which of the detailed checks below can match at all.
+_RE_CI_TRIGGERS = re.compile(
+    r'(?P<image>\bimage\b)|(?P<fetch>\b(?:curl|wget)\b)|(?P<secret>(?i:\b(?:password|token|secret|key)\b))'
+)
+
+
+@dataclass(frozen=True)
+class _CIRules:
+    # Rule codes: tabs, trailing whitespace, image tag, pipe to shell, hardcoded secret
+    codes: Tuple[str, str, str, str, str]
+    tab_replace: str
+    tab_message: str
+    pipe_message: str
+    secret_message: str
+    image_re: Pattern
+    # Format-specific image check: (line, image_re match) -> fixed line, or None if the tag is fine
+    image_fix: Callable[[str, Match], Optional[str]]
+    secret_re: Pattern
+    comment_prefixes: Tuple[str, ...] = ('#',)
+    rewrite_curl_pipe: bool = False
+    # Whether the pipe/secret checks see the line with the image already fixed
+    recheck_fixed_image: bool = True
+
+
+def _suggest_ci_image(img: str, bare_latest: bool = False) -> str:
+    """Pinned replacement for an unpinned image; bare_latest also rewrites a trailing 'latest' without ':'."""
+    if img.startswith('alpine'):
+        return 'alpine:3.19'
+    if img.startswith('python'):
+        return 'python:3.11'
+    if img.startswith('node'):
+        return 'node:20'
+    if img.endswith(':latest'):
+        return img[:-len(':latest')] + ':1.0.0'
+    if bare_latest and img.endswith('latest'):
+        return img[:-len('latest')] + '1.0.0'
+    if ':' not in img:
+        return img + ':1.0.0'
+    return img
+
+
+def _scan_ci_line(i: int, current: str, rules: _CIRules, errors: List[Issue],
+                  warnings: List[Issue], fixes: List[Fix]) -> str:
+    """Run the shared CI checks on one line and return the fixed line."""
+    tab_code, ws_code, image_code, pipe_code, secret_code = rules.codes
+
+    if '\t' in current:
+        warnings.append(Issue(i, 1, tab_code, rules.tab_message))
+        fixed = current.replace('\t', rules.tab_replace)
+        fixes.append(Fix(i, 'Zamieniono tabulatory na spacje', current.rstrip('\n'), fixed.rstrip('\n')))
+        current = fixed
+
+    if current.rstrip() != current:
+        warnings.append(Issue(i, 1, ws_code, 'Trailing whitespace'))
+        fixed = current.rstrip()
+        fixes.append(Fix(i, 'Usunięto trailing whitespace', current, fixed))
+        current = fixed
+
+    stripped = current.lstrip()
+    if not stripped or stripped.startswith(rules.comment_prefixes):
+        return current
+
+    triggers = {m.lastgroup for m in _RE_CI_TRIGGERS.finditer(current)}
+    if not triggers:
+        return current
+
+    fixed_image = None
+    m_image = rules.image_re.search(current) if 'image' in triggers else None
+    if m_image:
+        fixed = rules.image_fix(current, m_image)
+        if fixed is not None:
+            warnings.append(Issue(i, 1, image_code, 'Użyj konkretnej wersji image zamiast latest/braku tagu'))
+            fixes.append(Fix(i, 'Zmieniono image na wersjonowany tag', current.rstrip(), fixed.rstrip()))
+            if rules.recheck_fixed_image:
+                current = fixed
+            else:
+                fixed_image = fixed
+
+    if 'fetch' in triggers and '|' in current and _RE_SHELL.search(current):
+        warnings.append(Issue(i, 1, pipe_code, rules.pipe_message))
+        if rules.rewrite_curl_pipe and 'curl' in current and '| bash' in current:
+            fixed = _RE_CURL_BASH.sub(r"curl \1-o /tmp/script.sh && bash /tmp/script.sh", current)
+            if fixed != current:
+                fixes.append(Fix(i, 'Zamieniono curl|bash na zapis pliku + uruchomienie', current.rstrip(), fixed.rstrip()))
+                current = fixed
+
+    if 'secret' in triggers and rules.secret_re.search(current):
+        errors.append(Issue(i, 1, secret_code, rules.secret_message))
+
+    return current if fixed_image is None else fixed_image
@@ -2,7 +2,9 @@
 
 import re
 from typing import List
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+
+_SECRET_PATTERNS = ('password', 'secret', 'apiKey', 'connectionString')
 
 
 def analyze_csharp(code: str) -> AnalysisResult:
@@ -37,8 +39,7 @@ def analyze_csharp(code: str) -> AnalysisResult:
             warnings.append(Issue(i, 1, 'CS004', 'Użyj ILogger zamiast Console.Write'))
 
         # CS005: Hardcoded credentials
-        secret_patterns = ['password', 'secret', 'apiKey', 'connectionString']
-        for pattern in secret_patterns:
+        for pattern in _SECRET_PATTERNS:
             if re.search(rf'{pattern}\s*=\s*"[^"]+', stripped, re.I):
                 errors.append(Issue(i, 1, 'CS005', f'Hardcoded {pattern}'))
 
@@ -94,4 +95,4 @@ def analyze_csharp(code: str) -> AnalysisResult:
         if re.search(r'[=<>]\s*\d{2,}', stripped) and 'const' not in stripped and '//' not in stripped:
             warnings.append(Issue(i, 1, 'CS017', 'Magic number - użyj stałej z nazwą'))
 
-    return AnalysisResult('csharp', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('csharp', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
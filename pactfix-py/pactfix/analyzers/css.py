@@ -2,7 +2,10 @@
 
 import re
 from typing import List
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+
+_VENDOR_PREFIXES = ('-webkit-', '-moz-', '-ms-', '-o-')
+_DEPRECATED_PROPERTIES = ('clip:', 'zoom:')
 
 
 def analyze_css(code: str) -> AnalysisResult:
@@ -30,8 +33,7 @@ def analyze_css(code: str) -> AnalysisResult:
             warnings.append(Issue(i, 1, 'CSS002', 'ID selector - rozważ klasę dla reużywalności'))
 
         # CSS003: Vendor prefixes without standard
-        prefixes = ['-webkit-', '-moz-', '-ms-', '-o-']
-        for prefix in prefixes:
+        for prefix in _VENDOR_PREFIXES:
             if prefix in stripped:
                 prop = stripped.split(':')[0].replace(prefix, '').strip()
                 if prop + ':' not in '\n'.join(lines[max(0,i-3):i+3]):
@@ -92,8 +94,7 @@ def analyze_css(code: str) -> AnalysisResult:
                     warnings.append(Issue(i, 1, 'CSS013', 'calc() z wieloma jednostkami - sprawdź'))
 
         # CSS014: Deprecated properties
-        deprecated = ['clip:', 'zoom:']
-        for prop in deprecated:
+        for prop in _DEPRECATED_PROPERTIES:
             if prop in stripped:
                 warnings.append(Issue(i, 1, 'CSS014', f'Przestarzała właściwość: {prop[:-1]}'))
 
@@ -101,4 +102,4 @@ def analyze_css(code: str) -> AnalysisResult:
         if 'text-transform: uppercase' in stripped or 'text-transform:uppercase' in stripped:
             warnings.append(Issue(i, 1, 'CSS015', 'text-transform: uppercase może mieć problemy z locale'))
 
-    return AnalysisResult('css', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('css', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
@@ -2,7 +2,11 @@ import re
 import yaml
 from typing import List, Dict, Any
 
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+_SECRET_PATTERNS = ('PASSWORD', 'SECRET', 'API_KEY', 'TOKEN')
 
 
 def analyze_docker_compose(code: str) -> AnalysisResult:
@@ -14,8 +18,11 @@ def analyze_docker_compose(code: str) -> AnalysisResult:
     fixed_lines = lines.copy()
 
     try:
-        data = yaml.safe_load(code) or {}
+        data = yaml.load(code, Loader=_Loader) or {}
     except yaml.YAMLError:
+        data = None
+    # libyaml reads some input the pure-Python loader rejects (e.g. tab-continued text) as a scalar
+    if not isinstance(data, dict):
         return AnalysisResult('docker-compose', code, code, [Issue(1, 1, 'COMPOSE999', 'Invalid YAML')], [], [])
 
     services = data.get('services', {})
@@ -60,8 +67,8 @@ def analyze_docker_compose(code: str) -> AnalysisResult:
                     elif ':' not in image:
                         replacement = image + ':1.0.0'
                 # Fix line
-                indent_match = re.match(r'^(\s*)', lines[img_line - 1])
-                indent = indent_match.group(0) if indent_match else ''
+                img_src = lines[img_line - 1]
+                indent = img_src[:len(img_src) - len(img_src.lstrip())]
                 fixed_lines[img_line - 1] = f'{indent}image: {replacement}'
                 fixes.append(Fix(img_line, 'Zmieniono image na wersjonowany tag', f'image: {image}', f'image: {replacement}'))
 
@@ -95,10 +102,9 @@ def analyze_docker_compose(code: str) -> AnalysisResult:
 
         # Hardcoded secrets in environment
         env = svc.get('environment', {})
-        secret_patterns = ['PASSWORD', 'SECRET', 'API_KEY', 'TOKEN']
         if isinstance(env, dict):
             for k, v in env.items():
-                if any(p in k.upper() for p in secret_patterns) and isinstance(v, str) and not v.startswith('${'):
+                if any(p in k.upper() for p in _SECRET_PATTERNS) and isinstance(v, str) and not v.startswith('${'):
                     env_line = key_line_map.get(svc_name, 1)
                     for j in range(env_line, len(lines)):
                         if f'{k}:' in lines[j]:
@@ -115,7 +121,7 @@ def analyze_docker_compose(code: str) -> AnalysisResult:
                 v = v.strip()
                 if not k:
                     continue
-                if any(p in k.upper() for p in secret_patterns) and v and not v.startswith('${'):
+                if any(p in k.upper() for p in _SECRET_PATTERNS) and v and not v.startswith('${'):
                     env_line = key_line_map.get(svc_name, 1)
                     for j in range(env_line, len(lines)):
                         if item in lines[j]:
@@ -132,4 +138,4 @@ def analyze_docker_compose(code: str) -> AnalysisResult:
         fixed_lines.append('    driver: bridge')
         fixes.append(Fix(len(lines) + 2, 'Dodano sieć domyślną', '', 'networks:'))
 
-    return AnalysisResult('docker-compose', code, '\n'.join(fixed_lines), errors, warnings, fixes, {'services': list(services.keys())})
+    return AnalysisResult('docker-compose', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes, {'services': list(services.keys())})
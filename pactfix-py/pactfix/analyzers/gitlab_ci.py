@@ -1,7 +1,29 @@
 import re
-from typing import List
+from typing import List, Optional
 
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+from .ci_common import _CIRules, _scan_ci_line, _suggest_ci_image
+
+
+def _fix_gitlab_image(line: str, m_image) -> Optional[str]:
+    img = m_image.group('img').strip().strip('"\'')
+    if not (':latest' in img or img.endswith('latest') or ':' not in img):
+        return None
+    indent = line[:len(line) - len(line.lstrip())]
+    return f"{indent}image: {_suggest_ci_image(img, bare_latest=True)}"
+
+
+_GITLAB_RULES = _CIRules(
+    codes=('GL001', 'GL002', 'GL003', 'GL004', 'GL005'),
+    tab_replace='  ',
+    tab_message='Tabulatory w YAML mogą powodować błędy parsowania',
+    pipe_message='Pipe do bash/sh w CI może być niebezpieczny',
+    secret_message='Hardcoded secret w .gitlab-ci.yml',
+    image_re=re.compile(r'^\s*image\s*:\s*(?P<img>[^\s#]+)\s*$'),
+    image_fix=_fix_gitlab_image,
+    secret_re=re.compile(r'(?i)\b(password|token|secret|key)\b\s*:\s*(?!\$\{?\w+\}?)[^\s#]+'),
+    recheck_fixed_image=False,
+)
 
 
 def analyze_gitlab_ci(code: str) -> AnalysisResult:
@@ -13,50 +35,6 @@ def analyze_gitlab_ci(code: str) -> AnalysisResult:
     fixed_lines = lines.copy()
 
     for i, line in enumerate(lines, 1):
-        current = fixed_lines[i - 1]
-
-        if '\t' in current:
-            warnings.append(Issue(i, 1, 'GL001', 'Tabulatory w YAML mogą powodować błędy parsowania'))
-            fixed = current.replace('\t', '  ')
-            fixes.append(Fix(i, 'Zamieniono tabulatory na spacje', current.rstrip('\n'), fixed.rstrip('\n')))
-            fixed_lines[i - 1] = fixed
-            current = fixed
-
-        if current.rstrip() != current:
-            warnings.append(Issue(i, 1, 'GL002', 'Trailing whitespace'))
-            fixed = current.rstrip()
-            fixes.append(Fix(i, 'Usunięto trailing whitespace', current, fixed))
-            fixed_lines[i - 1] = fixed
-            current = fixed
-
-        m_image = re.match(r'^\s*image\s*:\s*(?P<img>[^\s#]+)\s*$', current)
-        if m_image:
-            img = m_image.group('img').strip().strip('"\'')
-            if ':latest' in img or img.endswith('latest') or ':' not in img:
-                warnings.append(Issue(i, 1, 'GL003', 'Użyj konkretnej wersji image zamiast latest/braku tagu'))
-                replacement = img
-                indent = re.match(r'^\s*', current).group(0)
-                if img.startswith('alpine'):
-                    replacement = 'alpine:3.19'
-                elif img.startswith('python'):
-                    replacement = 'python:3.11'
-                elif img.startswith('node'):
-                    replacement = 'node:20'
-                else:
-                    if img.endswith(':latest'):
-                        replacement = img[:-len(':latest')] + ':1.0.0'
-                    elif img.endswith('latest'):
-                        replacement = img[: -len('latest')] + '1.0.0'
-                    elif ':' not in img:
-                        replacement = img + ':1.0.0'
-                fixed = f"{indent}image: {replacement}"
-                fixes.append(Fix(i, 'Zmieniono image na wersjonowany tag', current.rstrip(), fixed.rstrip()))
-                fixed_lines[i - 1] = fixed
-
-        if re.search(r'\b(curl|wget)\b', current) and '|' in current and re.search(r'\b(bash|sh)\b', current):
-            warnings.append(Issue(i, 1, 'GL004', 'Pipe do bash/sh w CI może być niebezpieczny'))
-
-        if re.search(r'(?i)\b(password|token|secret|key)\b\s*:\s*(?!\$\{?\w+\}?)[^\s#]+', current):
-            errors.append(Issue(i, 1, 'GL005', 'Hardcoded secret w .gitlab-ci.yml'))
-
-    return AnalysisResult('gitlab-ci', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+        fixed_lines[i - 1] = _scan_ci_line(i, line, _GITLAB_RULES, errors, warnings, fixes)
+
+    return AnalysisResult('gitlab-ci', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
@@ -2,7 +2,9 @@
 
 import re
 from typing import List
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+
+_SECRET_PATTERNS = ('password', 'secret', 'apikey', 'api_key', 'token')
 
 
 def analyze_go(code: str) -> AnalysisResult:
@@ -58,8 +60,7 @@ def analyze_go(code: str) -> AnalysisResult:
             warnings.append(Issue(i, 1, 'GO008', 'time.Sleep w kodzie produkcyjnym - rozważ context.WithTimeout'))
 
         # GO009: Hardcoded credentials
-        secret_patterns = ['password', 'secret', 'apikey', 'api_key', 'token']
-        for pattern in secret_patterns:
+        for pattern in _SECRET_PATTERNS:
             if re.search(rf'{pattern}\s*[:=]\s*["\'][^"\']+["\']', stripped, re.I):
                 errors.append(Issue(i, 1, 'GO009', f'Hardcoded {pattern} - użyj zmiennych środowiskowych'))
 
@@ -88,4 +89,4 @@ def analyze_go(code: str) -> AnalysisResult:
             fixes.append(Fix(i, 'Zamieniono interface{} na any', stripped, fixed))
             fixed_lines[i-1] = indent_str + fixed
 
-    return AnalysisResult('go', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('go', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
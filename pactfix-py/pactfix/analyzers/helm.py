@@ -1,7 +1,7 @@
 import re
 from typing import List
 
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
 
 
 def analyze_helm(code: str) -> AnalysisResult:
@@ -24,6 +24,8 @@ def analyze_helm(code: str) -> AnalysisResult:
     if is_chart:
         for i, line in enumerate(lines, 1):
             stripped = line.strip()
+            if not stripped or stripped[0] == '#':
+                continue
             if stripped.lower().startswith('apiversion:'):
                 val = stripped.split(':', 1)[1].strip().strip('"\'')
                 if val != 'v2':
@@ -43,6 +45,8 @@ def analyze_helm(code: str) -> AnalysisResult:
 
         for i, line in enumerate(lines, 1):
             stripped = line.strip()
+            if not stripped or stripped[0] == '#':
+                continue
             indent = len(line) - len(line.lstrip())
             indent_str = line[:indent]
 
@@ -102,4 +106,4 @@ def analyze_helm(code: str) -> AnalysisResult:
         if re.search(r'image:\s*[^\s]+:latest', code):
             warnings.append(Issue(1, 1, 'HELM031', 'Hardcoded :latest w template - preferuj .Values.image.tag'))
 
-    return AnalysisResult('helm', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('helm', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
@@ -2,7 +2,10 @@
 
 import re
 from typing import List
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+
+_EVENT_HANDLERS = ('onclick=', 'onmouseover=', 'onsubmit=', 'onload=', 'onerror=')
+_DEPRECATED_TAGS = ('<font', '<center', '<marquee', '<blink', '<b>', '<i>')
 
 
 def analyze_html(code: str) -> AnalysisResult:
@@ -89,14 +92,12 @@ def analyze_html(code: str) -> AnalysisResult:
             warnings.append(Issue(i, 1, 'HTML007', 'Inline style - przenieś do CSS'))
 
         # HTML008: inline event handlers
-        event_handlers = ['onclick=', 'onmouseover=', 'onsubmit=', 'onload=', 'onerror=']
-        for handler in event_handlers:
+        for handler in _EVENT_HANDLERS:
             if handler in lower:
                 warnings.append(Issue(i, 1, 'HTML008', f'Inline {handler[:-1]} - użyj addEventListener'))
 
         # HTML009: deprecated tags
-        deprecated = ['<font', '<center', '<marquee', '<blink', '<b>', '<i>']
-        for tag in deprecated:
+        for tag in _DEPRECATED_TAGS:
             if tag in lower:
                 warnings.append(Issue(i, 1, 'HTML009', f'Przestarzały tag {tag} - użyj CSS'))
 
@@ -160,4 +161,4 @@ def analyze_html(code: str) -> AnalysisResult:
         fixed_lines.insert(insert_at, '    <title>Document</title>')
         fixes.append(Fix(1, 'Dodano <title>Document</title>', '', '<title>Document</title>'))
 
-    return AnalysisResult('html', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('html', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
@@ -2,7 +2,10 @@
 
 import re
 from typing import List
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+
+_SECRET_PATTERNS = ('password', 'secret', 'apiKey', 'api_key', 'token')
+_RAW_TYPES = ('List', 'Map', 'Set', 'ArrayList', 'HashMap', 'HashSet')
 
 
 def analyze_java(code: str) -> AnalysisResult:
@@ -37,14 +40,12 @@ def analyze_java(code: str) -> AnalysisResult:
             warnings.append(Issue(i, 1, 'JAVA004', 'Użyj loggera zamiast System.out/err'))
 
         # JAVA005: Hardcoded credentials
-        secret_patterns = ['password', 'secret', 'apiKey', 'api_key', 'token']
-        for pattern in secret_patterns:
+        for pattern in _SECRET_PATTERNS:
             if re.search(rf'{pattern}\s*=\s*"[^"]+', stripped, re.I):
                 errors.append(Issue(i, 1, 'JAVA005', f'Hardcoded {pattern}'))
 
         # JAVA006: Using raw types (generics without type parameter)
-        raw_types = ['List', 'Map', 'Set', 'ArrayList', 'HashMap', 'HashSet']
-        for rtype in raw_types:
+        for rtype in _RAW_TYPES:
             if re.search(rf'\b{rtype}\s+\w+\s*=', stripped) and '<' not in stripped:
                 warnings.append(Issue(i, 1, 'JAVA006', f'Raw type {rtype} - dodaj parametr typu'))
 
@@ -88,4 +89,4 @@ def analyze_java(code: str) -> AnalysisResult:
         if re.search(r'\w+\.\w+\(\)', stripped) and 'null' in '\n'.join(lines[max(0,i-3):i]):
             warnings.append(Issue(i, 1, 'JAVA015', 'Potencjalny NullPointerException - sprawdź null'))
 
-    return AnalysisResult('java', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('java', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
@@ -1,8 +1,62 @@
+import functools
 import re
 import yaml
-from typing import List, Dict, Any
-
-from ..analyzer import Issue, Fix, AnalysisResult
+from typing import List, Dict, Any, Iterator, Pattern, Tuple
+
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+
+# libyaml-backed loader when PyYAML was built with it; same plain dict/list output.
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Plain `---` separators let each document be parsed (and cached) on its own; directives,
+# `...` end markers and `--- <content>` fall back to parsing the whole stream at once.
+_DOC_MARKER_RE = re.compile(r'^---[ \t]*(?:#[^\n]*)?$', re.M)
+_DOC_AMBIGUOUS_RE = re.compile(r'^(?:%|\.\.\.|---[ \t]*[^\s#])', re.M)
+
+_KEY_RE = re.compile(r'^\s*([a-zA-Z0-9_-]+)\s*:')
+_PRIV_KEY = 'privileged:'
+# Matches (zero-width) at the start of every `value:` line naming a secret-like key and not using ${...}/valueFrom.
+_SECRET_VALUE_RE = re.compile(
+    r'(?m)^(?=[^\n]*value:)(?=[^\n]*(?i:password|secret|key|token))(?![^\n]*(?:\$\{|valueFrom:))'
+)
+
+_POD_KINDS = frozenset(('Deployment', 'Pod', 'StatefulSet', 'DaemonSet'))
+
+# Probe skeletons added to containers that lack them: key -> (label, lines relative to the container indent)
+_PROBE_SKELETONS = {
+    'livenessProbe': ('liveness', (
+        'livenessProbe:',
+        '  httpGet:',
+        '    path: /health',
+        '    port: 8080',
+        '  initialDelaySeconds: 30',
+        '  periodSeconds: 10',
+    )),
+    'readinessProbe': ('readiness', (
+        'readinessProbe:',
+        '  httpGet:',
+        '    path: /ready',
+        '    port: 8080',
+        '  initialDelaySeconds: 5',
+        '  periodSeconds: 5',
+    )),
+}
+
+# Common image suggestions
+_IMAGE_SUGGESTIONS = {
+    'nginx': 'nginx:1.25',
+    'redis': 'redis:7.2',
+    'postgres': 'postgres:15.4',
+    'mysql': 'mysql:8.1',
+    'python': 'python:3.11',
+    'node': 'node:20',
+    'alpine': 'alpine:3.19',
+    'ubuntu': 'ubuntu:22.04',
+    'debian': 'debian:12',
+    'centos': 'centos:9',
+    'httpd': 'httpd:2.4',
+    'busybox': 'busybox:1.36',
+}
 
 
 def analyze_kubernetes(code: str) -> AnalysisResult:
@@ -11,308 +65,359 @@ def analyze_kubernetes(code: str) -> AnalysisResult:
     fixes: List[Fix] = []
 
     lines = code.splitlines()
-    fixed_lines = lines.copy()
+    # Edits are recorded against the original lines and merged in one pass at the end
+    replaced: Dict[int, str] = {}
+    # (insert_before_idx, new_lines) against the original line positions, applied once at the end
+    pending_inserts: List[Tuple[int, List[str]]] = []
 
     try:
-        # Handle multi-document YAML
-        documents = list(yaml.safe_load_all(code))
-        if len(documents) == 1 and documents[0] is None:
-            documents = []
+        documents = _load_documents(code)
     except yaml.YAMLError:
         return AnalysisResult('kubernetes', code, code, [Issue(1, 1, 'K8S999', 'Invalid YAML')], [], [])
 
     # Track line numbers for keys via simple scan
     key_line_map: Dict[str, int] = {}
     for i, line in enumerate(lines, 1):
-        m = re.match(r'^\s*([a-zA-Z0-9_-]+)\s*:', line)
+        m = _KEY_RE.match(line)
         if m:
             key_line_map[m.group(1)] = i
 
+    index = _build_line_index(lines)
+
+    ns_line = key_line_map.get('namespace')
+
     # Process each document
     for doc in documents:
         if not isinstance(doc, dict):
             continue
 
         kind = doc.get('kind', '')
-        metadata = doc.get('metadata', {})
-        spec = doc.get('spec', {})
-        
+        metadata = doc.get('metadata') or {}
+        if not isinstance(metadata, dict):
+            metadata = {}
+
         # Check for namespace
         namespace = metadata.get('namespace', 'default')
         if namespace == 'default':
-            ns_line = key_line_map.get('namespace')
             if ns_line:
                 warnings.append(Issue(ns_line, 1, 'K8S007', 'Użycie default namespace'))
 
-        # Analyze based on kind
-        if kind in ('Deployment', 'Pod', 'StatefulSet', 'DaemonSet'):
-            # Get pod spec
-            if kind == 'Pod':
-                pod_spec = spec
-            else:
-                pod_spec = spec.get('template', {}).get('spec', {})
-
-            if not isinstance(pod_spec, dict):
-                continue
-
-            # Check containers
-            containers = pod_spec.get('containers', [])
-            if isinstance(containers, list):
-                for idx, container in enumerate(containers):
-                    if not isinstance(container, dict):
-                        continue
-                    
-                    container_name = container.get('name')
-                    container_display_name = container_name or f'container-{idx}'
-                    
-                    # Image tag fixes
-                    image = container.get('image', '')
-                    if image:
-                        if ':latest' in image or ':' not in image:
-                            # Find image line
-                            if container_name:
-                                img_line = _find_container_line(lines, container_name, 'image')
-                            else:
-                                img_line = _find_container_key_line_by_index(lines, idx, 'image')
-                            if img_line:
-                                warnings.append(Issue(img_line, 1, 'K8S004', 'Użyj konkretnego tagu'))
-                                replacement = _suggest_image_tag(image)
-                                if replacement != image:
-                                    fixed_lines[img_line - 1] = fixed_lines[img_line - 1].replace(image, replacement)
-                                    fixes.append(Fix(img_line, 'Zmieniono image na wersjonowany tag', f'image: {image}', f'image: {replacement}'))
-
-                    # Security context checks
-                    security_context = container.get('securityContext', {})
-                    if isinstance(security_context, dict):
-                        if security_context.get('privileged') is True:
-                            if container_name:
-                                priv_line = _find_container_line(lines, container_name, 'privileged')
-                            else:
-                                priv_line = _find_container_key_line_by_index(lines, idx, 'privileged')
-                            if priv_line:
-                                errors.append(Issue(priv_line, 1, 'K8S001', 'Kontener privileged'))
-                                # Remove privileged: true
-                                fixed_lines[priv_line - 1] = re.sub(r'^(\s*)privileged:\s*true.*$', r'\1# privileged: true - REMOVED', fixed_lines[priv_line - 1])
-                                fixes.append(Fix(priv_line, 'Usunięto privileged: true', 'privileged: true', '# privileged: true - REMOVED'))
-
-                        if security_context.get('runAsUser') == 0:
-                            root_line = _find_container_line(lines, container_name, 'runAsUser')
-                            if root_line:
-                                warnings.append(Issue(root_line, 1, 'K8S002', 'Kontener jako root'))
-
-                    # Resource limits
-                    resources = container.get('resources', {})
-                    if not isinstance(resources, dict) or not resources:
-                        res_line = _find_container_line(lines, container_name, 'name')
-                        if res_line:
-                            warnings.append(Issue(res_line, 1, 'K8S008', f'Brak resource limits dla {kind}'))
-                            # Add resource limits skeleton
-                            indent = _get_line_indent(lines[res_line - 1])
-                            skeleton = [
-                                f'{indent}resources:',
-                                f'{indent}  limits:',
-                                f'{indent}    cpu: 500m',
-                                f'{indent}    memory: 512Mi',
-                                f'{indent}  requests:',
-                                f'{indent}    cpu: 250m',
-                                f'{indent}    memory: 256Mi'
-                            ]
-                            # Insert after container name or image
-                            insert_line = res_line
-                            if ':' in lines[res_line - 1]:
-                                insert_line = res_line
-                            else:
-                                insert_line = res_line + 1
-                            
-                            for i, skel_line in enumerate(skeleton):
-                                fixed_lines.insert(insert_line + i, skel_line)
-                            
-                            fixes.append(Fix(insert_line, 'Dodano resource limits', '', 'resources: [...]'))
-
-                    # Probes
-                    if not container.get('livenessProbe'):
-                        probe_line = _find_container_line(lines, container_name, 'name')
-                        if probe_line:
-                            warnings.append(Issue(probe_line, 1, 'K8S009', f'Brak liveness probe dla {kind}'))
-                            # Add liveness probe skeleton
-                            indent = _get_line_indent(lines[probe_line - 1])
-                            probe_skel = [
-                                f'{indent}livenessProbe:',
-                                f'{indent}  httpGet:',
-                                f'{indent}    path: /health',
-                                f'{indent}    port: 8080',
-                                f'{indent}  initialDelaySeconds: 30',
-                                f'{indent}  periodSeconds: 10'
-                            ]
-                            insert_pos = _find_insert_position(lines, probe_line, container_name)
-                            for i, skel in enumerate(probe_skel):
-                                fixed_lines.insert(insert_pos + i, skel)
-                            fixes.append(Fix(insert_pos, 'Dodano liveness probe', '', 'livenessProbe: [...]'))
-
-                    if not container.get('readinessProbe'):
-                        probe_line = _find_container_line(lines, container_name, 'name')
-                        if probe_line:
-                            warnings.append(Issue(probe_line, 1, 'K8S009', f'Brak readiness probe dla {kind}'))
-                            # Add readiness probe skeleton
-                            indent = _get_line_indent(lines[probe_line - 1])
-                            probe_skel = [
-                                f'{indent}readinessProbe:',
-                                f'{indent}  httpGet:',
-                                f'{indent}    path: /ready',
-                                f'{indent}    port: 8080',
-                                f'{indent}  initialDelaySeconds: 5',
-                                f'{indent}  periodSeconds: 5'
-                            ]
-                            insert_pos = _find_insert_position(lines, probe_line, container_name)
-                            for i, skel in enumerate(probe_skel):
-                                fixed_lines.insert(insert_pos + i, skel)
-                            fixes.append(Fix(insert_pos, 'Dodano readiness probe', '', 'readinessProbe: [...]'))
-
-            # Pod-level security context
-            if not pod_spec.get('securityContext'):
-                warnings.append(Issue(1, 1, 'K8S010', f'Brak pod-level securityContext dla {kind}'))
-                # Add pod security context at the end of spec
-                spec_line = key_line_map.get('spec')
-                if spec_line:
-                    indent = _get_line_indent(lines[spec_line - 1])
-                    context_lines = [
-                        f'{indent}securityContext:',
-                        f'{indent}  runAsNonRoot: true',
-                        f'{indent}  runAsUser: 1000',
-                        f'{indent}  fsGroup: 2000'
-                    ]
-                    # Find where to insert (after containers or other spec fields)
-                    insert_pos = spec_line + 1
-                    while insert_pos < len(lines) and (lines[insert_pos].startswith(' ') or lines[insert_pos].strip() == ''):
-                        insert_pos += 1
-                    
-                    for i, ctx_line in enumerate(context_lines):
-                        fixed_lines.insert(insert_pos + i, ctx_line)
-                    fixes.append(Fix(insert_pos, 'Dodano pod securityContext', '', 'securityContext: [...]'))
-
-            # Check for hostPath volumes
-            volumes = pod_spec.get('volumes', [])
-            if isinstance(volumes, list):
-                for volume in volumes:
-                    if isinstance(volume, dict) and 'hostPath' in volume:
-                        vol_line = key_line_map.get('hostPath')
-                        if vol_line:
-                            warnings.append(Issue(vol_line, 1, 'K8S003', 'hostPath - użyj PersistentVolume'))
-
-        # Check for hardcoded secrets in any kind
-        if 'value:' in code:
-            for i, line in enumerate(lines, 1):
-                if 'value:' in line:
-                    stripped = line.strip()
-                    if any(secret in stripped.upper() for secret in ['PASSWORD', 'SECRET', 'KEY', 'TOKEN']):
-                        if '${' not in line and 'valueFrom:' not in line:
-                            errors.append(Issue(i, 1, 'K8S006', 'Hardcoded secret - użyj Secret'))
-
-    return AnalysisResult('kubernetes', code, '\n'.join(fixed_lines), errors, warnings, fixes, {'kinds': [d.get('kind') for d in documents if isinstance(d, dict)]})
-
-
-def _find_container_key_line_by_index(lines: List[str], container_index: int, key: str) -> int:
-    """Find the line number for a key within the Nth container item in spec.containers.
+        # Only pod-bearing kinds get the container/pod checks below
+        if not isinstance(kind, str) or kind not in _POD_KINDS:
+            continue
+
+        spec = doc.get('spec', {})
+        # Get pod spec
+        if kind == 'Pod':
+            pod_spec = spec
+        else:
+            template = spec.get('template', {}) if isinstance(spec, dict) else None
+            pod_spec = template.get('spec', {}) if isinstance(template, dict) else None
+
+        if not isinstance(pod_spec, dict):
+            continue
+
+        # Check containers
+        containers = pod_spec.get('containers', [])
+        if isinstance(containers, list):
+            for idx, container in enumerate(containers):
+                if not isinstance(container, dict):
+                    continue
+                
+                container_name = container.get('name')
+                container_display_name = container_name or f'container-{idx}'
+                
+                # Image tag fixes
+                image = container.get('image', '')
+                if image:
+                    if ':latest' in image or ':' not in image:
+                        # Find image line
+                        if container_name:
+                            img_line = _find_container_line(index, container_name, 'image')
+                        else:
+                            img_line = _find_container_key_line_by_index(index, idx, 'image')
+                        if img_line:
+                            warnings.append(Issue(img_line, 1, 'K8S004', 'Użyj konkretnego tagu'))
+                            replacement = _suggest_image_tag(image)
+                            if replacement != image:
+                                current = replaced.get(img_line, lines[img_line - 1])
+                                replaced[img_line] = current.replace(image, replacement)
+                                fixes.append(Fix(img_line, 'Zmieniono image na wersjonowany tag', f'image: {image}', f'image: {replacement}'))
+
+                # Security context checks
+                security_context = container.get('securityContext', {})
+                if isinstance(security_context, dict):
+                    if security_context.get('privileged') is True:
+                        if container_name:
+                            priv_line = _find_container_line(index, container_name, 'privileged')
+                        else:
+                            priv_line = _find_container_key_line_by_index(index, idx, 'privileged')
+                        if priv_line:
+                            errors.append(Issue(priv_line, 1, 'K8S001', 'Kontener privileged'))
+                            # Remove privileged: true
+                            current = replaced.get(priv_line, lines[priv_line - 1])
+                            indent = index['indents'][priv_line - 1]
+                            if current.startswith(_PRIV_KEY, indent) and current[indent + len(_PRIV_KEY):].lstrip().startswith('true'):
+                                replaced[priv_line] = current[:indent] + '# privileged: true - REMOVED'
+                            fixes.append(Fix(priv_line, 'Usunięto privileged: true', 'privileged: true', '# privileged: true - REMOVED'))
+
+                    if security_context.get('runAsUser') == 0:
+                        root_line = _find_container_line(index, container_name, 'runAsUser')
+                        if root_line:
+                            warnings.append(Issue(root_line, 1, 'K8S002', 'Kontener jako root'))
+
+                # Resource limits and probes are anchored on the container's name line
+                name_line = _find_container_line(index, container_name, 'name')
+
+                resources = container.get('resources', {})
+                if not isinstance(resources, dict) or not resources:
+                    if name_line:
+                        warnings.append(Issue(name_line, 1, 'K8S008', f'Brak resource limits dla {kind}'))
+                        # Add resource limits skeleton
+                        indent = ' ' * index['indents'][name_line - 1]
+                        skeleton = [
+                            f'{indent}resources:',
+                            f'{indent}  limits:',
+                            f'{indent}    cpu: 500m',
+                            f'{indent}    memory: 512Mi',
+                            f'{indent}  requests:',
+                            f'{indent}    cpu: 250m',
+                            f'{indent}    memory: 256Mi'
+                        ]
+                        # Insert after container name or image
+                        insert_line = name_line
+                        if ':' in lines[name_line - 1]:
+                            insert_line = name_line
+                        else:
+                            insert_line = name_line + 1
+                        
+                        pending_inserts.append((insert_line, skeleton))
+                        fixes.append(Fix(insert_line, 'Dodano resource limits', '', 'resources: [...]'))
+
+                # Probes
+                for probe_key, (label, template) in _PROBE_SKELETONS.items():
+                    if not container.get(probe_key) and name_line:
+                        warnings.append(Issue(name_line, 1, 'K8S009', f'Brak {label} probe dla {kind}'))
+                        indent = ' ' * index['indents'][name_line - 1]
+                        insert_pos = _find_insert_position(index, name_line)
+                        pending_inserts.append((insert_pos, [indent + t for t in template]))
+                        fixes.append(Fix(insert_pos, f'Dodano {label} probe', '', f'{probe_key}: [...]'))
+
+        # Pod-level security context
+        if not pod_spec.get('securityContext'):
+            warnings.append(Issue(1, 1, 'K8S010', f'Brak pod-level securityContext dla {kind}'))
+            # Add pod security context at the end of spec
+            spec_line = key_line_map.get('spec')
+            if spec_line:
+                indent = ' ' * index['indents'][spec_line - 1]
+                context_lines = [
+                    f'{indent}securityContext:',
+                    f'{indent}  runAsNonRoot: true',
+                    f'{indent}  runAsUser: 1000',
+                    f'{indent}  fsGroup: 2000'
+                ]
+                # Find where to insert (after containers or other spec fields)
+                insert_pos = spec_line + 1
+                while insert_pos < len(lines) and (lines[insert_pos].startswith(' ') or index['is_blank'][insert_pos]):
+                    insert_pos += 1
+                
+                pending_inserts.append((insert_pos, context_lines))
+                fixes.append(Fix(insert_pos, 'Dodano pod securityContext', '', 'securityContext: [...]'))
+
+        # Check for hostPath volumes
+        volumes = pod_spec.get('volumes', [])
+        if isinstance(volumes, list):
+            for volume in volumes:
+                if isinstance(volume, dict) and 'hostPath' in volume:
+                    vol_line = key_line_map.get('hostPath')
+                    if vol_line:
+                        warnings.append(Issue(vol_line, 1, 'K8S003', 'hostPath - użyj PersistentVolume'))
+
+    # Check for hardcoded secrets in any kind; the scan covers the whole stream, so run it once
+    if 'value:' in code and any(isinstance(doc, dict) for doc in documents):
+        line_no, pos = 1, 0
+        for m in _SECRET_VALUE_RE.finditer(code):
+            line_no += code.count('\n', pos, m.start())
+            pos = m.start()
+            errors.append(Issue(line_no, 1, 'K8S006', 'Hardcoded secret - użyj Secret'))
+
+    fixed_lines = _apply_edits(lines, replaced, pending_inserts)
+    return AnalysisResult('kubernetes', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes, {'kinds': [d.get('kind') for d in documents if isinstance(d, dict)]})
+
+
+def _apply_edits(lines: List[str], replaced: Dict[int, str],
+                 inserts: List[Tuple[int, List[str]]]) -> Iterator[str]:
+    """Yield the fixed manifest: replaced lines (1-based) swapped in, inserted blocks
+    spliced before their 0-based position (blocks at the same spot keep their order)."""
+    by_pos: Dict[int, List[str]] = {}
+    for pos, new_lines in inserts:
+        by_pos.setdefault(min(pos, len(lines)), []).extend(new_lines)
 
-    This is a fallback for minimal YAML inputs where a container may not have a `name:` field.
-    """
-    containers_line_idx = None
-    containers_indent = 0
     for i, line in enumerate(lines):
-        if line.strip().startswith('containers:'):
-            containers_line_idx = i
-            containers_indent = len(line) - len(line.lstrip())
-            break
+        if i in by_pos:
+            yield from by_pos[i]
+        yield replaced.get(i + 1, line)
+    yield from by_pos.get(len(lines), ())
 
-    if containers_line_idx is None:
-        return 0
 
-    item_start_idx = None
-    item_indent = 0
-    item_count = -1
-    for i in range(containers_line_idx + 1, len(lines)):
-        line = lines[i]
-        if not line.strip():
-            continue
-        indent = len(line) - len(line.lstrip())
+@functools.lru_cache(maxsize=128)
+def _load_documents(code: str) -> tuple:
+    """Parse a (multi-document) manifest; cached since the analyzer never mutates the result."""
+    if _DOC_AMBIGUOUS_RE.search(code):
+        documents = tuple(yaml.load_all(code, Loader=_Loader))
+    else:
+        chunks = _DOC_MARKER_RE.split(code)
+        # Comments/blank lines before the first marker are not a document of their own
+        if len(chunks) > 1 and not _has_content(chunks[0]):
+            chunks = chunks[1:]
+        documents = tuple(_load_document(chunk) for chunk in chunks)
+    # libyaml reads some input the pure-Python loader rejects (e.g. tab-continued text) as a scalar;
+    # re-check such documents with SafeLoader so they are reported as invalid just the same
+    if _Loader is not yaml.SafeLoader and any(doc is not None and not isinstance(doc, (dict, list)) for doc in documents):
+        documents = tuple(yaml.load_all(code, Loader=yaml.SafeLoader))
+    if len(documents) == 1 and documents[0] is None:
+        return ()
+    return documents
+
+
+@functools.lru_cache(maxsize=512)
+def _load_document(chunk: str) -> Any:
+    """Parse one document; editing one resource of a bundle keeps the others cached."""
+    return yaml.load(chunk, Loader=_Loader)
+
+
+def _has_content(chunk: str) -> bool:
+    return any(line.strip() and not line.lstrip().startswith('#') for line in chunk.splitlines())
+
+
+@functools.lru_cache(maxsize=64)
+def _key_re(key: str) -> Pattern:
+    return re.compile(rf'^\s*(?:-\s*)?{re.escape(key)}\s*:')
+
+
+def _build_line_index(lines: List[str]) -> Dict[str, Any]:
+    """Strip and measure every line once; container lookups below share the result."""
+    stripped: List[str] = []
+    indents: List[int] = []
+    for line in lines:
+        # One lstrip gives both the indent and (after rstrip of the shorter tail) the stripped text
+        text = line.lstrip()
+        indents.append(len(line) - len(text))
+        stripped.append(text.rstrip())
+    return {
+        'stripped': stripped,
+        'indents': indents,
+        'is_blank': [not text for text in stripped],
+        'is_dash': [text.startswith('-') for text in stripped],
+        'raw': lines,
+        'regions': {},
+        'items': None,
+    }
 
-        # Left containers list (next key in spec/etc.)
-        if indent <= containers_indent and not line.lstrip().startswith('-'):
-            break
 
-        if line.lstrip().startswith('-'):
-            item_count += 1
-            if item_count == container_index:
-                item_start_idx = i
-                item_indent = indent
-                break
+def _container_items(index: Dict[str, Any]):
+    """Return (containers_indent, [(line_idx, indent), ...]) for list items under the first `containers:`."""
+    if index['items'] is None:
+        stripped, indents = index['stripped'], index['indents']
+        is_blank, is_dash = index['is_blank'], index['is_dash']
+        containers_line_idx = next((i for i, s in enumerate(stripped) if s.startswith('containers:')), None)
+        items = []
+        containers_indent = 0
+        if containers_line_idx is not None:
+            containers_indent = indents[containers_line_idx]
+            for i in range(containers_line_idx + 1, len(stripped)):
+                if is_blank[i]:
+                    continue
+                # Left containers list (next key in spec/etc.)
+                if indents[i] <= containers_indent and not is_dash[i]:
+                    break
+                if is_dash[i]:
+                    items.append((i, indents[i]))
+        index['items'] = (containers_indent, items)
+    return index['items']
+
+
+def _find_container_key_line_by_index(index: Dict[str, Any], container_index: int, key: str) -> int:
+    """Find the line number for a key within the Nth container item in spec.containers.
 
-    if item_start_idx is None:
+    This is a fallback for minimal YAML inputs where a container may not have a `name:` field.
+    """
+    containers_indent, items = _container_items(index)
+    if container_index >= len(items):
         return 0
 
-    key_re = re.compile(rf'^\s*(?:-\s*)?{re.escape(key)}\s*:')
-    for j in range(item_start_idx, len(lines)):
-        line = lines[j]
-        if j > item_start_idx and line.strip():
-            indent = len(line) - len(line.lstrip())
-            if indent <= containers_indent and not line.lstrip().startswith('-'):
+    item_start_idx, item_indent = items[container_index]
+    indents, is_blank, is_dash, raw = index['indents'], index['is_blank'], index['is_dash'], index['raw']
+    key_re = _key_re(key)
+    for j in range(item_start_idx, len(raw)):
+        if j > item_start_idx and not is_blank[j]:
+            if indents[j] <= containers_indent and not is_dash[j]:
                 break
-            if line.lstrip().startswith('-') and indent == item_indent:
+            if is_dash[j] and indents[j] == item_indent:
                 break
 
-        if key_re.search(line):
+        if key_re.search(raw[j]):
             return j + 1
 
     return 0
 
 
-def _find_container_line(lines: List[str], container_name: str, key: str) -> int:
-    """Find the line number for a specific key within a container definition."""
+def _container_region(index: Dict[str, Any], container_name: str) -> List[int]:
+    """Line indexes that belong to the container(s) whose `name:` line matches container_name."""
+    stripped, indents, raw = index['stripped'], index['indents'], index['raw']
+    region = []
     in_container = False
     container_indent = 0
-    
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
-        indent = len(line) - len(line.lstrip())
-        
+    name_tok = f'name: {container_name}'
+
+    for i, text in enumerate(stripped):
         # Check for container start
-        if f'name: {container_name}' in stripped:
+        if name_tok in text:
             in_container = True
-            container_indent = indent
+            container_indent = indents[i]
             continue
-        
+
         # Check if we've left the container
-        if in_container and stripped and indent <= container_indent and not line.startswith(' '):
+        if in_container and text and indents[i] <= container_indent and not raw[i].startswith(' '):
             in_container = False
             continue
-        
-        # Look for the key within container
-        if in_container and f'{key}:' in stripped:
-            return i
-    
-    return 0
 
+        if in_container:
+            region.append(i)
 
-def _get_line_indent(line: str) -> str:
-    """Get the indentation of a line as spaces."""
-    return line[:len(line) - len(line.lstrip())]
+    return region
 
 
-def _find_insert_position(lines: List[str], start_line: int, container_name: str) -> int:
+def _find_container_line(index: Dict[str, Any], container_name: str, key: str) -> int:
+    """Find the line number for a specific key within a container definition."""
+    regions = index['regions']
+    region = regions.get(container_name)
+    if region is None:
+        region = regions[container_name] = _container_region(index, container_name)
+
+    stripped = index['stripped']
+    key_tok = key + ':'
+    for i in region:
+        if key_tok in stripped[i]:
+            return i + 1
+
+    return 0
+
+
+def _find_insert_position(index: Dict[str, Any], start_line: int) -> int:
     """Find a good position to insert new lines within a container."""
-    container_indent = len(lines[start_line - 1]) - len(lines[start_line - 1].lstrip())
-    
-    for i in range(start_line, min(start_line + 20, len(lines))):
-        line = lines[i]
-        indent = len(line) - len(line.lstrip())
-        
-        # If we find a line with less or equal indentation that's not empty, we've left the container
-        if line.strip() and indent <= container_indent and i > start_line:
+    stripped, indents, is_blank = index['stripped'], index['indents'], index['is_blank']
+    container_indent = indents[start_line - 1]
+
+    # The first non-empty line at or left of the container's indent ends the container
+    for i in range(start_line + 1, min(start_line + 20, len(stripped))):
+        if not is_blank[i] and indents[i] <= container_indent:
             return i
-    
+
     return start_line + 1
 
 
+@functools.lru_cache(maxsize=256)
 def _suggest_image_tag(image: str) -> str:
     """Suggest a specific version tag for an image."""
     if ':latest' in image:
@@ -321,26 +426,11 @@ def _suggest_image_tag(image: str) -> str:
         base = image
     else:
         return image
-    
-    # Common image suggestions
-    suggestions = {
-        'nginx': 'nginx:1.25',
-        'redis': 'redis:7.2',
-        'postgres': 'postgres:15.4',
-        'mysql': 'mysql:8.1',
-        'python': 'python:3.11',
-        'node': 'node:20',
-        'alpine': 'alpine:3.19',
-        'ubuntu': 'ubuntu:22.04',
-        'debian': 'debian:12',
-        'centos': 'centos:9',
-        'httpd': 'httpd:2.4',
-        'busybox': 'busybox:1.36'
-    }
-    
-    for name, suggested in suggestions.items():
-        if base == name or base.endswith(f'/{name}'):
-            return suggested
-    
+
+    # Matches `name` as well as `registry/.../name`
+    suggested = _IMAGE_SUGGESTIONS.get(base[base.rfind('/') + 1:])
+    if suggested:
+        return suggested
+
     # Default to a generic version
     return f"{base}:1.0.0"
@@ -2,7 +2,7 @@
 
 import re
 from typing import List
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
 
 
 def analyze_makefile(code: str) -> AnalysisResult:
@@ -103,4 +103,4 @@ def analyze_makefile(code: str) -> AnalysisResult:
     if 'clean' not in targets:
         warnings.append(Issue(1, 1, 'MAKE012', 'Brak targetu clean'))
 
-    return AnalysisResult('makefile', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('makefile', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
@@ -2,7 +2,9 @@
 
 import re
 from typing import List
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+
+_SECRET_PATTERNS = ('password', 'secret', 'api_key', 'token')
 
 
 def analyze_ruby(code: str) -> AnalysisResult:
@@ -38,8 +40,7 @@ def analyze_ruby(code: str) -> AnalysisResult:
             warnings.append(Issue(i, 1, 'RUBY004', 'puts/print - użyj Loggera'))
 
         # RUBY005: Hardcoded credentials
-        secret_patterns = ['password', 'secret', 'api_key', 'token']
-        for pattern in secret_patterns:
+        for pattern in _SECRET_PATTERNS:
             if re.search(rf'{pattern}\s*=\s*["\'][^"\']+["\']', stripped, re.I):
                 errors.append(Issue(i, 1, 'RUBY005', f'Hardcoded {pattern}'))
 
@@ -90,4 +91,4 @@ def analyze_ruby(code: str) -> AnalysisResult:
         if '!!' in stripped:
             warnings.append(Issue(i, 1, 'RUBY014', 'Podwójna negacja - użyj .present? lub !!var'))
 
-    return AnalysisResult('ruby', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('ruby', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
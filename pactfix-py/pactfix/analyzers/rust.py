@@ -2,7 +2,9 @@
 
 import re
 from typing import List
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+
+_SECRET_PATTERNS = ('password', 'secret', 'api_key', 'token')
 
 
 def analyze_rust(code: str) -> AnalysisResult:
@@ -58,8 +60,7 @@ def analyze_rust(code: str) -> AnalysisResult:
             warnings.append(Issue(i, 1, 'RUST008', 'println! zamiast log/tracing - użyj proper logging'))
 
         # RUST009: Hardcoded secrets
-        secret_patterns = ['password', 'secret', 'api_key', 'token']
-        for pattern in secret_patterns:
+        for pattern in _SECRET_PATTERNS:
             if re.search(rf'{pattern}\s*=\s*"[^"]+', stripped, re.I):
                 errors.append(Issue(i, 1, 'RUST009', f'Hardcoded {pattern}'))
 
@@ -87,4 +88,4 @@ def analyze_rust(code: str) -> AnalysisResult:
             if '#[must_use]' not in prev_lines:
                 warnings.append(Issue(i, 1, 'RUST014', 'Rozważ #[must_use] dla funkcji zwracającej Result'))
 
-    return AnalysisResult('rust', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('rust', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
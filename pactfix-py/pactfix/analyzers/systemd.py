@@ -2,7 +2,10 @@
 
 import re
 from typing import List
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+
+_VALID_SERVICE_TYPES = ('simple', 'forking', 'oneshot', 'dbus', 'notify', 'idle')
+_SECRET_PATTERNS = ('PASSWORD', 'SECRET', 'API_KEY', 'TOKEN')
 
 
 def analyze_systemd(code: str) -> AnalysisResult:
@@ -68,8 +71,7 @@ def analyze_systemd(code: str) -> AnalysisResult:
         # SYSTEMD006: Type directive
         if stripped.startswith('Type='):
             service_type = stripped.split('=')[1].strip()
-            valid_types = ['simple', 'forking', 'oneshot', 'dbus', 'notify', 'idle']
-            if service_type not in valid_types:
+            if service_type not in _VALID_SERVICE_TYPES:
                 errors.append(Issue(i, 1, 'SYSTEMD006', f'Nieprawidłowy Type: {service_type}'))
                 fixed = 'Type=simple'
                 fixes.append(Fix(i, 'Zmieniono Type na simple', stripped, fixed))
@@ -83,8 +85,7 @@ def analyze_systemd(code: str) -> AnalysisResult:
 
         # SYSTEMD008: Environment with hardcoded secrets
         if stripped.startswith('Environment='):
-            secret_patterns = ['PASSWORD', 'SECRET', 'API_KEY', 'TOKEN']
-            for pattern in secret_patterns:
+            for pattern in _SECRET_PATTERNS:
                 if pattern in stripped.upper() and '${' not in stripped:
                     errors.append(Issue(i, 1, 'SYSTEMD008', f'Hardcoded {pattern} - użyj EnvironmentFile'))
 
@@ -154,4 +155,4 @@ def analyze_systemd(code: str) -> AnalysisResult:
     if not has_user:
         warnings.append(Issue(1, 1, 'SYSTEMD004', 'Brak User= - usługa będzie działać jako root'))
 
-    return AnalysisResult('systemd', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('systemd', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
@@ -1,7 +1,7 @@
 import re
 from typing import List, Dict, Set, Tuple
 
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
 
 
 def analyze_terraform(code: str) -> AnalysisResult:
@@ -198,4 +198,4 @@ def analyze_terraform(code: str) -> AnalysisResult:
         'total_variables_used': len(variables_used)
     }
     
-    return AnalysisResult('terraform', code, '\n'.join(fixed_lines), errors, warnings, fixes, context)
+    return AnalysisResult('terraform', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes, context)
@@ -2,7 +2,7 @@
 
 import re
 from typing import List
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
 
 
 def analyze_typescript(code: str) -> AnalysisResult:
@@ -88,4 +88,4 @@ def analyze_typescript(code: str) -> AnalysisResult:
                     if imp and imp not in code.replace(stripped, ''):
                         warnings.append(Issue(i, 1, 'TS014', f'Potencjalnie nieużywany import: {imp}'))
 
-    return AnalysisResult('typescript', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('typescript', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
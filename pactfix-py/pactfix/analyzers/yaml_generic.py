@@ -2,7 +2,10 @@
 
 import re
 from typing import List
-from ..analyzer import Issue, Fix, AnalysisResult
+from ..analyzer import Issue, Fix, AnalysisResult, _join_fixed_lines
+
+_SPECIAL_VALUES = ('yes', 'no', 'on', 'off', 'true', 'false', 'null')
+_SECRET_PATTERNS = ('password', 'secret', 'api_key', 'token', 'credential')
 
 
 def analyze_yaml(code: str) -> AnalysisResult:
@@ -45,8 +48,7 @@ def analyze_yaml(code: str) -> AnalysisResult:
             fixed_lines[i-1] = fixed
 
         # YAML004: Unquoted special values
-        special_values = ['yes', 'no', 'on', 'off', 'true', 'false', 'null']
-        for val in special_values:
+        for val in _SPECIAL_VALUES:
             if re.search(rf':\s+{val}\s*$', stripped, re.I):
                 if f'"{val}"' not in stripped.lower() and f"'{val}'" not in stripped.lower():
                     if val.lower() != stripped.split(':')[1].strip().lower():
@@ -95,8 +97,7 @@ def analyze_yaml(code: str) -> AnalysisResult:
                     break
 
         # YAML008: Hardcoded secrets
-        secret_patterns = ['password', 'secret', 'api_key', 'token', 'credential']
-        for pattern in secret_patterns:
+        for pattern in _SECRET_PATTERNS:
             if re.search(rf'{pattern}\s*:\s*["\']?[^\s${{][^#]*', stripped, re.I):
                 if '${' not in stripped and '$(' not in stripped:
                     errors.append(Issue(i, 1, 'YAML008', f'Hardcoded {pattern} - użyj zmiennej środowiskowej'))
@@ -113,4 +114,4 @@ def analyze_yaml(code: str) -> AnalysisResult:
 
         prev_indent = current_indent if stripped else prev_indent
 
-    return AnalysisResult('yaml', code, '\n'.join(fixed_lines), errors, warnings, fixes)
+    return AnalysisResult('yaml', code, _join_fixed_lines(code, fixed_lines, fixes), errors, warnings, fixes)
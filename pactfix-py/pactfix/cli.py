@@ -1,10 +1,16 @@
 """Pactfix CLI - Command line interface for code analysis."""
 
 import argparse
+import contextlib
+import functools
+import hashlib
 import json
+import re
 import sys
 import os
+import shutil
 from pathlib import Path
+from typing import List, Set
 from datetime import datetime
 
 # Load environment variables from .env file if it exists
@@ -14,11 +20,288 @@ try:
 except ImportError:
     pass  # python-dotenv not installed, use system environment only
 
-from .analyzer import analyze_code, detect_language, SUPPORTED_LANGUAGES, add_fix_comments
-from .sandbox import Sandbox, detect_project_language, create_all_dockerfiles, LANGUAGE_DOCKERFILES
+try:
+    import orjson
+except ImportError:
+    orjson = None  # orjson not installed, use stdlib json
+
+
+_KIND_RE = re.compile(r'^kind:\s*["\']?([A-Za-z]+)', re.M)
+
+# Below this many files a worker pool costs more to start than it saves
+_PARALLEL_MIN_FILES = 32
+_STATUS_OK = '✅'
+_STATUS_FAIL = '❌'
+# Batch modes collect per-file report lines and write them out in chunks of this many lines
+_OUTPUT_CHUNK_LINES = 256
+# Files picked up by --batch
+_BATCH_SUFFIXES = frozenset(('.sh', '.py', '.php', '.js', '.sql', '.tf', '.yml', '.yaml', '.conf'))
+_BATCH_NAMES = frozenset(('Dockerfile', 'docker-compose.yml', 'docker-compose.yaml'))
+# --path scans these suffixes and names, pruning the excluded directories while walking
+_PROJECT_SUFFIXES = frozenset(('.sh', '.py', '.php', '.js', '.ts', '.sql', '.tf', '.yml', '.yaml',
+                               '.conf', '.go', '.rs', '.java', '.cs', '.rb', '.html', '.css',
+                               '.json', '.jsonc', '.toml', '.ini', '.cfg', '.tpl', '.gotmpl'))
+_PROJECT_NAMES = frozenset(('Dockerfile', 'Makefile', 'Jenkinsfile', '.gitlab-ci.yml', '.gitlab-ci.yaml'))
+_PROJECT_EXCLUDE_DIRS = frozenset(('.git', '.pactfix', '_fixtures', 'node_modules', '__pycache__', 'venv', '.venv',
+                                   'vendor', 'target', 'build', 'dist', '.idea', '.vscode'))
+# --fix-all keeps results of unchanged files under <examples>/.pactfix_cache/<digest[:2]>/<digest>.json
+_CACHE_DIRNAME = '.pactfix_cache'
+# --path --sandbox keeps them under <project>/.pactfix/cache/ in the same layout (in-place runs do not cache)
+_PROJECT_CACHE_DIR = os.path.join('.pactfix', 'cache')
+
+# Directories this process already created (or found), so repeated writes skip the mkdir syscalls
+_CREATED_DIRS: Set[str] = set()
+
+
+def _ensure_dir(path) -> None:
+    """mkdir -p, once per directory per process."""
+    key = str(path) or '.'
+    if key not in _CREATED_DIRS:
+        os.makedirs(key, exist_ok=True)
+        _CREATED_DIRS.add(key)
+
+
+def _json_bytes(obj, pretty: bool = True):
+    """JSON as UTF-8 bytes from orjson, or None when orjson is missing or rejects obj."""
+    if orjson is None:
+        return None
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+    try:
+        return orjson.dumps(obj, option=option)
+    except TypeError:
+        return None  # e.g. integers beyond 64 bits; let json handle it
+
+
+def _json_layout(pretty: bool) -> dict:
+    return {'indent': 2} if pretty else {'separators': (',', ':')}
+
+
+def _dumps(obj, pretty: bool = True) -> str:
+    """Serialize obj as indented (or compact) JSON; orjson produces the same layout when installed."""
+    data = _json_bytes(obj, pretty)
+    if data is not None:
+        return data.decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, **_json_layout(pretty))
+
+
+def _write_json(path, obj, pretty: bool = True) -> None:
+    """Write obj as indented (or compact) UTF-8 JSON to path."""
+    data = _json_bytes(obj, pretty)
+    if data is not None:
+        Path(path).write_bytes(data)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, **_json_layout(pretty))
+
+
+def _jsonl_line(obj) -> bytes:
+    """One compact JSON Lines record, newline included."""
+    data = _json_bytes(obj, pretty=False)
+    if data is None:
+        data = _dumps(obj, pretty=False).encode('utf-8')
+    return data + b'\n'
+
+
+def _print_json(obj, pretty: bool = True) -> None:
+    """Print obj as JSON, handing orjson's bytes straight to the stdout buffer."""
+    buffer = getattr(sys.stdout, 'buffer', None)
+    data = _json_bytes(obj, pretty) if buffer is not None else None
+    if data is None:
+        print(_dumps(obj, pretty))
+        return
+    sys.stdout.flush()  # keep anything already printed ahead of the JSON
+    buffer.write(data + b'\n')
+    buffer.flush()
+
 
+def _read_text(path, errors: str = 'strict') -> str:
+    """Read a UTF-8 file with one read; newlines are normalized like text-mode open()."""
+    return _decode_text(Path(path).read_bytes(), errors)
+
+
+def _decode_text(data: bytes, errors: str = 'strict') -> str:
+    code = data.decode('utf-8', errors)
+    if '\r' in code:
+        code = code.replace('\r\n', '\n').replace('\r', '\n')
+    return code
+
+
+@functools.lru_cache(maxsize=1)
+def _package_mtime() -> int:
+    """Newest mtime (ns) among pactfix's own sources."""
+    package_dir = Path(__file__).resolve().parent
+    return max(p.stat().st_mtime_ns for d in (package_dir, package_dir / 'analyzers') for p in d.glob('*.py'))
+
+
+def _cache_salt() -> str:
+    """Package version plus newest source mtime, so editing any analyzer invalidates the cache."""
+    from . import __version__
+
+    return f'{__version__}:{_package_mtime()}'
+
+
+def _cache_key(path_str: str, code: str, comment: bool) -> str:
+    # The path takes part in language detection, so it is part of the key
+    h = hashlib.blake2b(digest_size=16)
+    for part in (_cache_salt(), path_str, 'comment' if comment else ''):
+        h.update(part.encode('utf-8', 'surrogatepass') + b'\0')
+    h.update(code.encode('utf-8', 'surrogatepass'))
+    return h.hexdigest()
+
+
+def _cache_get(cache_dir: str, digest: str):
+    from .analyzer import AnalysisResult
+
+    try:
+        data = (Path(cache_dir) / digest[:2] / f'{digest}.json').read_bytes()
+        return AnalysisResult.from_dict(orjson.loads(data) if orjson is not None else json.loads(data))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
 
-def main():
+
+def _cache_put(cache_dir: str, digest: str, result) -> None:
+    target = Path(cache_dir) / digest[:2] / f'{digest}.json'
+    tmp = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+    try:
+        _ensure_dir(target.parent)
+        _write_json(tmp, result.to_dict(), pretty=False)
+        os.replace(tmp, target)
+    except (OSError, TypeError, ValueError):
+        pass  # a result that cannot be cached is simply analyzed again next time
+
+
+def _fixed_output_paths(subdir: Path, file_path: Path):
+    """(fixed_dir, fixed_path, log_path) that --fix-all writes for one example file."""
+    fixed_dir = subdir / 'fixed'
+    return fixed_dir, fixed_dir / f"fixed_{file_path.name}", fixed_dir / f"{file_path.stem}_log.json"
+
+
+def _reuse_fixed_output(file_path: Path, fixed_path: Path, log_path: Path, comment: bool):
+    """Result recorded by an earlier --fix-all run, if its fixed_ file is newer than both the
+    source and pactfix itself and was produced with the same --comment setting; else None."""
+    from .analyzer import AnalysisResult
+
+    try:
+        fixed_mtime = fixed_path.stat().st_mtime_ns
+        if fixed_mtime < file_path.stat().st_mtime_ns or fixed_mtime < _package_mtime():
+            return None
+        log = json.loads(log_path.read_bytes())
+        if log.get('source') != str(file_path) or log.get('comment', False) != comment:
+            return None
+        return AnalysisResult.from_dict(log['details'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _analyze_path(task):
+    """Read and analyze one file for the batch modes; returns (result, error message, unchanged, pristine),
+    where unchanged means the fixed code equals the decoded text and pristine that the file has no \\r."""
+    from .analyzer import analyze_code, add_fix_comments
+
+    path_str, comment, cache_dir, errors = task
+    try:
+        data = Path(path_str).read_bytes()
+        code = _decode_text(data, errors)
+        # Newline normalization counts as a change: the fixed file must not keep \r
+        pristine = b'\r' not in data
+        digest = None
+        result = None
+        if cache_dir:
+            digest = _cache_key(path_str, code, comment)
+            result = _cache_get(cache_dir, digest)
+        if result is None:
+            result = analyze_code(code, path_str, _manifest_language(code, path_str))
+            if comment and result.fixes:
+                result.fixed_code = add_fix_comments(result)
+            if digest:
+                _cache_put(cache_dir, digest, result)
+        return result, None, result.fixed_code == code, pristine
+    except Exception as e:
+        return None, str(e), False, False
+
+
+def _analyze_paths(paths, comment: bool = False, jobs: int = 0, cache_dir=None, errors: str = 'strict'):
+    """Yield _analyze_path results for each path in order, fanning out to worker processes when
+    there are enough files (jobs: 0 = one per CPU, 1 = serial)."""
+    tasks = [(str(p), comment, str(cache_dir) if cache_dir else None, errors) for p in paths]
+    if jobs == 1 or len(tasks) < _PARALLEL_MIN_FILES:
+        yield from map(_analyze_path, tasks)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(jobs or os.cpu_count() or 1, len(tasks))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        yield from ex.map(_analyze_path, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+
+
+def _output_chunk_lines() -> int:
+    """Report lines to buffer per write: every line on a terminal so progress stays live."""
+    isatty = getattr(sys.stdout, 'isatty', None)
+    return 1 if isatty is not None and isatty() else _OUTPUT_CHUNK_LINES
+
+
+def _flush_lines(out: List[str]) -> None:
+    """Write buffered report lines to stdout in one call and empty the buffer."""
+    if not out:
+        return
+    text = '\n'.join(out) + '\n'
+    out.clear()
+    stream = sys.stdout
+    buffer = getattr(stream, 'buffer', None)
+    # Encode once and bypass the text layer, unless it would have translated newlines
+    if buffer is None or os.linesep != '\n':
+        stream.write(text)
+        return
+    stream.flush()
+    buffer.write(text.encode(stream.encoding or 'utf-8', stream.errors or 'strict'))
+    buffer.flush()
+
+
+def _walk_source_files(root, suffixes=_PROJECT_SUFFIXES, names=_PROJECT_NAMES,
+                       exclude_dirs=_PROJECT_EXCLUDE_DIRS) -> List[Path]:
+    """Collect matching files under root in one scandir pass, never entering excluded directories."""
+    found = []
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in exclude_dirs:
+                            stack.append(entry.path)
+                        continue
+                    dot = name.rfind('.')
+                    if ((dot >= 0 and name[dot:] in suffixes) or name in names) and entry.is_file():
+                        found.append(Path(entry.path))
+                except OSError:
+                    continue
+    return found
+
+
+def _peek_kind(code: str, max_chars: int = 4096) -> str:
+    """Return the Kubernetes `kind` from the head of a manifest, or '' if it does not look like one."""
+    head = code[:max_chars]
+    if 'apiVersion:' not in head:
+        return ''
+    m = _KIND_RE.search(head)
+    return m.group(1) if m else ''
+
+
+def _manifest_language(code: str, path: str):
+    """'kubernetes' for a manifest that a generic *.yaml name would send to the 'yaml' analyzer, else None."""
+    from .analyzer import detect_language
+
+    if path.endswith(('.yml', '.yaml')) and _peek_kind(code) and detect_language(code, path) == 'yaml':
+        return 'kubernetes'
+    return None
+
+
+def main(argv: List[str] = None):
     parser = argparse.ArgumentParser(
         prog='pactfix',
         description='Multi-language code and config file analyzer and fixer'
@@ -26,23 +309,39 @@ def main():
     
     parser.add_argument('input', nargs='?', help='Input file to analyze')
     parser.add_argument('-o', '--output', help='Output file for fixed code')
-    parser.add_argument('-l', '--language', choices=SUPPORTED_LANGUAGES, help='Force language detection')
+    parser.add_argument('-l', '--language', metavar='LANGUAGE', help='Force language detection (e.g. bash, python, kubernetes)')
     parser.add_argument('--comment', action='store_true', help='Insert comment above each applied fix line')
     parser.add_argument('--log-file', help='Output JSON log file')
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     parser.add_argument('--batch', help='Process all files in directory')
     parser.add_argument('--fix-all', action='store_true', help='Fix all files in examples/')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
+    parser.add_argument('--pretty-json', action='store_true',
+                        help='Indent JSON logs and reports (default: compact; --json output is indented on a terminal)')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='Worker processes for --batch/--fix-all/--path (0 = CPU count, 1 = serial)')
+    parser.add_argument('--no-cache', action='store_true', help='Re-analyze every file in --fix-all/--path --sandbox, ignoring cached results')
+    parser.add_argument('--force', action='store_true', help='Rewrite every fixed_ file in --fix-all, even if it is up to date')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='With --path: only list files with errors and print a one-line summary')
     parser.add_argument('--version', action='version', version='pactfix 1.0.0')
     
     # New options for project scanning and sandbox
     parser.add_argument('--path', help='Project path to scan and fix all files')
-    parser.add_argument('--sandbox', action='store_true', help='Run fixes in Docker sandbox')
+    parser.add_argument('--sandbox', action='store_true', help='Run fixes in Docker sandbox (with PACTFIX_NO_DOCKER=1, Python/Node.js '
+                        'tests run on the host in a copy of the project, without any isolation)')
     parser.add_argument('--sandbox-only', action='store_true', help='Only setup sandbox without fixing')
     parser.add_argument('--test', action='store_true', help='Run tests in sandbox after fixing')
     parser.add_argument('--init-dockerfiles', help='Create Dockerfiles for all languages in specified directory')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    # Analyzers (and PyYAML) load only once there is something to analyze
+    if args.language:
+        from .analyzer import SUPPORTED_LANGUAGES
+        if args.language not in SUPPORTED_LANGUAGES:
+            choices = ', '.join(repr(lang) for lang in SUPPORTED_LANGUAGES)
+            parser.error(f"argument -l/--language: invalid choice: {args.language!r} (choose from {choices})")
     
     # Initialize Dockerfiles for all languages
     if args.init_dockerfiles:
@@ -50,7 +349,8 @@ def main():
     
     # Project-wide scanning with --path
     if args.path:
-        return process_project(args.path, args.comment, args.sandbox, args.test, args.verbose)
+        return process_project(args.path, args.comment, args.sandbox, args.test, args.verbose, args.pretty_json,
+                               args.jobs, not args.no_cache, args.quiet)
     
     # Sandbox-only mode
     if args.sandbox_only:
@@ -58,101 +358,117 @@ def main():
         return setup_sandbox_only(input_path, args.verbose)
     
     if args.fix_all:
-        return fix_all_examples(args.verbose, args.comment)
+        return fix_all_examples(args.verbose, args.comment, args.jobs, not args.no_cache, args.force,
+                                args.pretty_json)
     
     if args.batch:
-        return process_batch(args.batch, args.verbose)
+        return process_batch(args.batch, args.verbose, args.jobs)
     
     if args.input == '-':
-        return process_stdin(args.output, args.language, args.comment, args.log_file, args.verbose, args.json)
+        return process_stdin(args.output, args.language, args.comment, args.log_file, args.verbose, args.json,
+                                 args.pretty_json)
 
     if not args.input:
         if not sys.stdin.isatty():
-            return process_stdin(args.output, args.language, args.comment, args.log_file, args.verbose, args.json)
+            return process_stdin(args.output, args.language, args.comment, args.log_file, args.verbose, args.json,
+                                 args.pretty_json)
         parser.print_help()
         return 1
     
-    return process_file(args.input, args.output, args.language, args.comment, args.log_file, args.verbose, args.json)
+    return process_file(args.input, args.output, args.language, args.comment, args.log_file, args.verbose, args.json,
+                        args.pretty_json)
 
 
-def process_file(input_path: str, output_path: str = None, language: str = None,
-                 comment: bool = False, log_file: str = None, verbose: bool = False,
-                 as_json: bool = False) -> int:
-    """Process a single file."""
-    try:
-        with open(input_path, 'r', encoding='utf-8') as f:
-            code = f.read()
-    except FileNotFoundError:
-        print(f"❌ Plik nie istnieje: {input_path}", file=sys.stderr)
-        return 1
-    except Exception as e:
-        print(f"❌ Błąd odczytu: {e}", file=sys.stderr)
-        return 1
-    
-    result = analyze_code(code, input_path, language)
-    if comment:
-        result.fixed_code = add_fix_comments(result)
-    
+def _emit(result, display_name: str, input_file: str, output_path: str = None,
+          log_file: str = None, verbose: bool = False, as_json: bool = False,
+          pretty_json: bool = False) -> int:
+    """Report one analyzed input (console/JSON), write the fixed code and log; returns the exit code."""
     if as_json:
-        print(json.dumps(result.to_dict(), indent=2, ensure_ascii=False))
+        _print_json(result.to_dict(), pretty_json or sys.stdout.isatty())
         return 0
-    
-    timestamp = datetime.now().strftime('%H:%M:%S')
-    
+
+    # One clock read serves both the console prefix and the log record; compact output needs neither
+    now = datetime.now() if verbose or log_file else None
+    timestamp = now.strftime('%H:%M:%S') if verbose else ''
+    n_errors, n_warnings, n_fixes = len(result.errors), len(result.warnings), len(result.fixes)
+
     if verbose:
-        print(f"{timestamp} 📋 Analyzing: {input_path}")
+        print(f"{timestamp} 📋 Analyzing: {display_name}")
         print(f"{timestamp} ✅ Language detected: {result.language}")
-        print(f"{timestamp} ❌ Errors: {len(result.errors)}")
-        print(f"{timestamp} ⚠️  Warnings: {len(result.warnings)}")
-        print(f"{timestamp} ✅ Fixes applied: {len(result.fixes)}")
-        
+        print(f"{timestamp} ❌ Errors: {n_errors}")
+        print(f"{timestamp} ⚠️  Warnings: {n_warnings}")
+        print(f"{timestamp} ✅ Fixes applied: {n_fixes}")
+
         for err in result.errors:
             print(f"{timestamp} ❌   Line {err.line}: [{err.code}] {err.message}")
-        
+
         for warn in result.warnings:
             print(f"{timestamp} ⚠️    Line {warn.line}: [{warn.code}] {warn.message}")
-        
+
         for fix in result.fixes:
             print(f"{timestamp} 📋   Line {fix.line}: {fix.description}")
             print(f"    Before: {fix.before}")
             print(f"    After:  {fix.after}")
     else:
-        status = "✅" if len(result.errors) == 0 else "❌"
-        print(f"{status} {input_path}: {len(result.errors)} errors, {len(result.warnings)} warnings, {len(result.fixes)} fixes [{result.language}]")
-    
+        status = _STATUS_OK if n_errors == 0 else _STATUS_FAIL
+        print(f"{status} {display_name}: {n_errors} errors, {n_warnings} warnings, {n_fixes} fixes [{result.language}]")
+
     if output_path:
         try:
-            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(result.fixed_code)
+            _ensure_dir(os.path.dirname(output_path))
+            Path(output_path).write_bytes(result.fixed_code.encode('utf-8'))
             if verbose:
                 print(f"{timestamp} ✅ Fixed code written to: {output_path}")
         except Exception as e:
             print(f"❌ Błąd zapisu: {e}", file=sys.stderr)
             return 1
-    
+
     if log_file:
         log_data = {
-            'timestamp': datetime.now().isoformat(),
-            'input_file': input_path,
+            'timestamp': now.isoformat(),
+            'input_file': input_file,
             'output_file': output_path,
             'result': result.to_dict()
         }
         try:
-            os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
-            with open(log_file, 'w', encoding='utf-8') as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
+            _ensure_dir(os.path.dirname(log_file))
+            _write_json(log_file, log_data, pretty_json)
             if verbose:
                 print(f"{timestamp} ✅ Log written to: {log_file}")
         except Exception as e:
             print(f"❌ Błąd zapisu logu: {e}", file=sys.stderr)
+
+    return 0 if n_errors == 0 else 1
+
+
+def process_file(input_path: str, output_path: str = None, language: str = None,
+                 comment: bool = False, log_file: str = None, verbose: bool = False,
+                 as_json: bool = False, pretty_json: bool = False) -> int:
+    """Process a single file."""
+    from .analyzer import analyze_code, add_fix_comments
+
+    try:
+        code = _read_text(input_path)
+    except FileNotFoundError:
+        print(f"❌ Plik nie istnieje: {input_path}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"❌ Błąd odczytu: {e}", file=sys.stderr)
+        return 1
+
+    result = analyze_code(code, input_path, language or _manifest_language(code, input_path))
+    if comment and result.fixes:
+        result.fixed_code = add_fix_comments(result)
     
-    return 0 if len(result.errors) == 0 else 1
+    return _emit(result, input_path, input_path, output_path, log_file, verbose, as_json, pretty_json)
 
 
 def process_stdin(output_path: str = None, language: str = None, comment: bool = False,
-                  log_file: str = None, verbose: bool = False, as_json: bool = False) -> int:
+                  log_file: str = None, verbose: bool = False, as_json: bool = False,
+                  pretty_json: bool = False) -> int:
     """Process code from stdin."""
+    from .analyzer import analyze_code, add_fix_comments
+
     try:
         code = sys.stdin.read()
     except Exception as e:
@@ -160,133 +476,91 @@ def process_stdin(output_path: str = None, language: str = None, comment: bool =
         return 1
 
     filename_hint = output_path or '<stdin>'
-    result = analyze_code(code, filename_hint, language)
-    if comment:
+    result = analyze_code(code, filename_hint, language or _manifest_language(code, filename_hint))
+    if comment and result.fixes:
         result.fixed_code = add_fix_comments(result)
 
-    if as_json:
-        print(json.dumps(result.to_dict(), indent=2, ensure_ascii=False))
-        return 0
+    return _emit(result, filename_hint, '<stdin>', output_path, log_file, verbose, as_json, pretty_json)
 
-    timestamp = datetime.now().strftime('%H:%M:%S')
 
-    if verbose:
-        print(f"{timestamp} 📋 Analyzing: {filename_hint}")
-        print(f"{timestamp} ✅ Language detected: {result.language}")
-        print(f"{timestamp} ❌ Errors: {len(result.errors)}")
-        print(f"{timestamp} ⚠️  Warnings: {len(result.warnings)}")
-        print(f"{timestamp} ✅ Fixes applied: {len(result.fixes)}")
-
-        for err in result.errors:
-            print(f"{timestamp} ❌   Line {err.line}: [{err.code}] {err.message}")
-
-        for warn in result.warnings:
-            print(f"{timestamp} ⚠️    Line {warn.line}: [{warn.code}] {warn.message}")
-
-        for fix in result.fixes:
-            print(f"{timestamp} 📋   Line {fix.line}: {fix.description}")
-            print(f"    Before: {fix.before}")
-            print(f"    After:  {fix.after}")
-    else:
-        status = "✅" if len(result.errors) == 0 else "❌"
-        print(f"{status} {filename_hint}: {len(result.errors)} errors, {len(result.warnings)} warnings, {len(result.fixes)} fixes [{result.language}]")
-
-    if output_path:
-        try:
-            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(result.fixed_code)
-            if verbose:
-                print(f"{timestamp} ✅ Fixed code written to: {output_path}")
-        except Exception as e:
-            print(f"❌ Błąd zapisu: {e}", file=sys.stderr)
-            return 1
-
-    if log_file:
-        log_data = {
-            'timestamp': datetime.now().isoformat(),
-            'input_file': '<stdin>',
-            'output_file': output_path,
-            'result': result.to_dict()
-        }
-        try:
-            os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
-            with open(log_file, 'w', encoding='utf-8') as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
-            if verbose:
-                print(f"{timestamp} ✅ Log written to: {log_file}")
-        except Exception as e:
-            print(f"❌ Błąd zapisu logu: {e}", file=sys.stderr)
-
-    return 0 if len(result.errors) == 0 else 1
-
-
-def process_batch(directory: str, verbose: bool = False) -> int:
+def process_batch(directory: str, verbose: bool = False, jobs: int = 0) -> int:
     """Process all files in a directory."""
     path = Path(directory)
     if not path.is_dir():
         print(f"❌ Nie jest katalogiem: {directory}", file=sys.stderr)
         return 1
     
-    extensions = ['.sh', '.py', '.php', '.js', '.sql', '.tf', '.yml', '.yaml', '.conf']
-    files = []
-    for ext in extensions:
-        files.extend(path.rglob(f'*{ext}'))
-    
-    # Also find Dockerfiles
-    files.extend(path.rglob('Dockerfile'))
-    files.extend(path.rglob('docker-compose.yml'))
-    files.extend(path.rglob('docker-compose.yaml'))
-    
-    if not files:
+    # One walk over the tree instead of an rglob per pattern; every dirpath starts with
+    # the top directory string, so the display path is a plain slice
+    top = os.fspath(path)
+    entries = []
+    for dirpath, _, filenames in os.walk(top):
+        rel_dir = dirpath[len(top):].lstrip(os.sep)
+        for name in filenames:
+            # All suffixes are single extensions, so the text from the last dot is enough
+            dot = name.rfind('.')
+            if (dot >= 0 and name[dot:] in _BATCH_SUFFIXES) or name in _BATCH_NAMES:
+                entries.append((Path(dirpath, name), os.path.join(rel_dir, name)))
+    
+    if not entries:
         print(f"⚠️  Brak plików do analizy w: {directory}")
         return 0
     
-    print(f"📋 Znaleziono {len(files)} plików do analizy\n")
+    print(f"📋 Znaleziono {len(entries)} plików do analizy\n")
     
     total_errors = 0
     total_warnings = 0
     total_fixes = 0
     
-    for file_path in sorted(set(files)):
+    entries.sort()
+    files = [file_path for file_path, _ in entries]
+    out: List[str] = []
+    chunk_lines = _output_chunk_lines()
+    for (file_path, rel_path), (result, error, _, _) in zip(entries, _analyze_paths(files, jobs=jobs)):
+        if error is not None:
+            out.append(f"❌ {file_path}: {error}")
+            continue
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code = f.read()
-            
-            result = analyze_code(code, str(file_path))
             total_errors += len(result.errors)
             total_warnings += len(result.warnings)
             total_fixes += len(result.fixes)
             
-            status = "✅" if len(result.errors) == 0 else "❌"
-            rel_path = file_path.relative_to(path) if file_path.is_relative_to(path) else file_path
-            print(f"{status} {rel_path}: {len(result.errors)}E {len(result.warnings)}W {len(result.fixes)}F [{result.language}]")
+            status = _STATUS_OK if not result.errors else _STATUS_FAIL
+            out.append(f"{status} {rel_path}: {len(result.errors)}E {len(result.warnings)}W {len(result.fixes)}F [{result.language}]")
             
             if verbose:
                 for err in result.errors:
-                    print(f"   ❌ L{err.line}: [{err.code}] {err.message}")
+                    out.append(f"   ❌ L{err.line}: [{err.code}] {err.message}")
                 for warn in result.warnings:
-                    print(f"   ⚠️  L{warn.line}: [{warn.code}] {warn.message}")
+                    out.append(f"   ⚠️  L{warn.line}: [{warn.code}] {warn.message}")
         
         except Exception as e:
-            print(f"❌ {file_path}: {e}")
+            out.append(f"❌ {file_path}: {e}")
+        if len(out) >= chunk_lines:
+            _flush_lines(out)
+    _flush_lines(out)
     
     print(f"\n📊 Podsumowanie: {total_errors} errors, {total_warnings} warnings, {total_fixes} fixes")
     return 0 if total_errors == 0 else 1
 
 
-def fix_all_examples(verbose: bool = False, comment: bool = False) -> int:
-    """Fix all files in examples/ directory and save to fixed/ subdirectories."""
-    env_examples = os.environ.get('PACTFIX_EXAMPLES_DIR')
+@functools.lru_cache(maxsize=8)
+def _find_examples_dir(env_examples: str, cwd: str) -> Path:
+    """Resolve the examples/ directory: $PACTFIX_EXAMPLES_DIR or ./examples, else the nearest
+    examples/ above the package. cwd is part of the cache key because the default is relative."""
     examples_dir = Path(env_examples) if env_examples else Path('examples')
- 
     if not examples_dir.exists():
         for parent in Path(__file__).resolve().parents:
             candidate = parent / 'examples'
-            if candidate.exists() and candidate.is_dir():
-                examples_dir = candidate
-                break
-     
+            if candidate.is_dir():
+                return candidate
+    return examples_dir
+
+
+def fix_all_examples(verbose: bool = False, comment: bool = False, jobs: int = 0,
+                     use_cache: bool = True, force: bool = False, pretty_json: bool = False) -> int:
+    """Fix all files in examples/ directory and save to fixed/ subdirectories."""
+    examples_dir = _find_examples_dir(os.environ.get('PACTFIX_EXAMPLES_DIR'), os.getcwd())
     if not examples_dir.exists():
         print(f"❌ Nie znaleziono katalogu examples/", file=sys.stderr)
         return 1
@@ -294,68 +568,92 @@ def fix_all_examples(verbose: bool = False, comment: bool = False) -> int:
     print(f"🔧 Pactfix - naprawianie wszystkich plików w {examples_dir}\n")
     
     results = []
+    total_errors = total_warnings = total_fixes = 0
     
+    sources = []
     for subdir in sorted(examples_dir.iterdir()):
-        if not subdir.is_dir():
+        if not subdir.is_dir() or subdir.name.startswith('.'):
             continue
         
         for file_path in subdir.iterdir():
             if file_path.is_file() and not file_path.name.startswith('fixed_'):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        code = f.read()
-                    
-                    result = analyze_code(code, str(file_path))
-                    if comment:
-                        result.fixed_code = add_fix_comments(result)
-                    
-                    # Save fixed file
-                    fixed_dir = subdir / 'fixed'
-                    fixed_dir.mkdir(exist_ok=True)
-                    
-                    fixed_path = fixed_dir / f"fixed_{file_path.name}"
-                    with open(fixed_path, 'w', encoding='utf-8') as f:
-                        f.write(result.fixed_code)
-                    
-                    # Save log
-                    log_path = fixed_dir / f"{file_path.stem}_log.json"
-                    log_data = {
-                        'source': str(file_path),
-                        'fixed': str(fixed_path),
-                        'language': result.language,
-                        'errors': len(result.errors),
-                        'warnings': len(result.warnings),
-                        'fixes': len(result.fixes),
-                        'details': result.to_dict()
-                    }
-                    with open(log_path, 'w', encoding='utf-8') as f:
-                        json.dump(log_data, f, indent=2, ensure_ascii=False)
-                    
-                    status = "✅" if len(result.errors) == 0 else "❌"
-                    print(f"{status} {subdir.name}/{file_path.name}: {len(result.errors)}E {len(result.warnings)}W {len(result.fixes)}F [{result.language}]")
-                    
-                    if verbose:
-                        for err in result.errors:
-                            print(f"   ❌ L{err.line}: [{err.code}] {err.message}")
-                        for fix in result.fixes:
-                            print(f"   🔧 L{fix.line}: {fix.description}")
-                    
-                    results.append({
-                        'file': str(file_path),
-                        'language': result.language,
-                        'errors': len(result.errors),
-                        'warnings': len(result.warnings),
-                        'fixes': len(result.fixes)
-                    })
+                sources.append((subdir, file_path))
+
+    # Files whose fixed_ output is still current are reported from their log, not re-analyzed
+    reused = {}
+    if not force:
+        for i, (subdir, file_path) in enumerate(sources):
+            _, fixed_path, log_path = _fixed_output_paths(subdir, file_path)
+            previous = _reuse_fixed_output(file_path, fixed_path, log_path, comment)
+            if previous is not None:
+                reused[i] = previous
+
+    cache_dir = examples_dir / _CACHE_DIRNAME if use_cache else None
+    stale = [file_path for i, (_, file_path) in enumerate(sources) if i not in reused]
+    analyzed = _analyze_paths(stale, comment, jobs, cache_dir)
+    out: List[str] = []
+    chunk_lines = _output_chunk_lines()
+    for i, (subdir, file_path) in enumerate(sources):
+        if i in reused:
+            result, error, verbatim = reused[i], None, False
+        else:
+            result, error, unchanged, pristine = next(analyzed)
+            verbatim = unchanged and pristine
+        if error is not None:
+            out.append(f"❌ {file_path}: {error}")
+            continue
+        try:
+            fixed_dir, fixed_path, log_path = _fixed_output_paths(subdir, file_path)
+            if i not in reused:
+                # Save fixed file
+                _ensure_dir(fixed_dir)
+                if verbatim:
+                    # Nothing to fix: let the kernel copy the source instead of re-encoding it
+                    shutil.copyfile(file_path, fixed_path)
+                else:
+                    fixed_path.write_bytes(result.fixed_code.encode('utf-8'))
                 
-                except Exception as e:
-                    print(f"❌ {file_path}: {e}")
+                # Save log
+                log_data = {
+                    'source': str(file_path),
+                    'fixed': str(fixed_path),
+                    'language': result.language,
+                    'comment': comment,
+                    'errors': len(result.errors),
+                    'warnings': len(result.warnings),
+                    'fixes': len(result.fixes),
+                    'details': result.to_dict()
+                }
+                _write_json(log_path, log_data, pretty_json)
+            
+            status = _STATUS_OK if not result.errors else _STATUS_FAIL
+            out.append(f"{status} {subdir.name}/{file_path.name}: {len(result.errors)}E {len(result.warnings)}W {len(result.fixes)}F [{result.language}]")
+            
+            if verbose:
+                for err in result.errors:
+                    out.append(f"   ❌ L{err.line}: [{err.code}] {err.message}")
+                for fix in result.fixes:
+                    out.append(f"   🔧 L{fix.line}: {fix.description}")
+            
+            n_errors, n_warnings, n_fixes = len(result.errors), len(result.warnings), len(result.fixes)
+            total_errors += n_errors
+            total_warnings += n_warnings
+            total_fixes += n_fixes
+            results.append({
+                'file': str(file_path),
+                'language': result.language,
+                'errors': n_errors,
+                'warnings': n_warnings,
+                'fixes': n_fixes
+            })
+        
+        except Exception as e:
+            out.append(f"❌ {file_path}: {e}")
+        if len(out) >= chunk_lines:
+            _flush_lines(out)
+    _flush_lines(out)
     
     # Summary
-    total_errors = sum(r['errors'] for r in results)
-    total_warnings = sum(r['warnings'] for r in results)
-    total_fixes = sum(r['fixes'] for r in results)
-    
     print(f"\n{'='*60}")
     print(f"📊 Podsumowanie: {len(results)} plików")
     print(f"   ❌ Errors:   {total_errors}")
@@ -364,15 +662,14 @@ def fix_all_examples(verbose: bool = False, comment: bool = False) -> int:
     
     # Save summary
     summary_path = examples_dir / 'fix_summary.json'
-    with open(summary_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'timestamp': datetime.now().isoformat(),
-            'total_files': len(results),
-            'total_errors': total_errors,
-            'total_warnings': total_warnings,
-            'total_fixes': total_fixes,
-            'files': results
-        }, f, indent=2, ensure_ascii=False)
+    _write_json(summary_path, {
+        'timestamp': datetime.now().isoformat(),
+        'total_files': len(results),
+        'total_errors': total_errors,
+        'total_warnings': total_warnings,
+        'total_fixes': total_fixes,
+        'files': results
+    }, pretty_json)
     
     print(f"\n✅ Raport zapisany: {summary_path}")
     
@@ -381,6 +678,8 @@ def fix_all_examples(verbose: bool = False, comment: bool = False) -> int:
 
 def init_dockerfiles(output_dir: str) -> int:
     """Create Dockerfiles for all supported languages."""
+    from .sandbox import create_all_dockerfiles
+
     output_path = Path(output_dir)
     print(f"🐳 Creating Dockerfiles in {output_path}\n")
     
@@ -395,6 +694,8 @@ def init_dockerfiles(output_dir: str) -> int:
 
 def setup_sandbox_only(project_path: str, verbose: bool = False) -> int:
     """Setup sandbox without running fixes."""
+    from .sandbox import Sandbox
+
     path = Path(project_path).resolve()
     
     if not path.exists():
@@ -416,162 +717,163 @@ def setup_sandbox_only(project_path: str, verbose: bool = False) -> int:
 
 
 def process_project(project_path: str, comment: bool = False, sandbox: bool = False,
-                    run_tests: bool = False, verbose: bool = False) -> int:
+                    run_tests: bool = False, verbose: bool = False, pretty_json: bool = False,
+                    jobs: int = 0, use_cache: bool = True, quiet: bool = False) -> int:
     """Process entire project - scan, fix all files, optionally run in sandbox.
     
     Modes:
     - Without --sandbox: Fix files IN PLACE (replace original files)
     - With --sandbox: Copy fixed files to .pactfix/ and run Docker sandbox
+    
+    quiet lists only files with errors and ends with a one-line summary.
     """
+    from .sandbox import Sandbox, detect_project_language
+
     path = Path(project_path).resolve()
     
     if not path.exists():
         print(f"❌ Path does not exist: {path}", file=sys.stderr)
         return 1
     
-    mode_str = "🐳 SANDBOX MODE" if sandbox else "📝 IN-PLACE FIX MODE"
-    print(f"🔍 Pactfix - scanning project: {path}")
-    print(f"   {mode_str}\n")
-    
-    # Detect project language
-    language, stats = detect_project_language(path)
-    print(f"📋 Detected project language: {language}")
-    if verbose and stats.get('all_scores'):
-        print(f"   Scores: {stats['all_scores']}")
-    print()
-    
-    # Find all files to process
-    extensions = ['.sh', '.py', '.php', '.js', '.ts', '.sql', '.tf', '.yml', '.yaml',
-                  '.conf', '.go', '.rs', '.java', '.cs', '.rb', '.html', '.css',
-                  '.json', '.jsonc', '.toml', '.ini', '.cfg', '.tpl', '.gotmpl']
-    
-    files_to_process = []
-    for ext in extensions:
-        files_to_process.extend(path.rglob(f'*{ext}'))
-    
-    # Add Dockerfiles and special files
-    files_to_process.extend(path.rglob('Dockerfile'))
-    files_to_process.extend(path.rglob('Makefile'))
-    files_to_process.extend(path.rglob('Jenkinsfile'))
-    files_to_process.extend(path.rglob('.gitlab-ci.yml'))
-    files_to_process.extend(path.rglob('.gitlab-ci.yaml'))
-    
-    # Filter out hidden directories and common excludes
-    exclude_dirs = {'.git', '.pactfix', '_fixtures', 'node_modules', '__pycache__', 'venv', '.venv', 
-                    'vendor', 'target', 'build', 'dist', '.idea', '.vscode'}
-    
-    files_to_process = [
-        f for f in files_to_process 
-        if not any(excl in f.parts for excl in exclude_dirs)
-        and f.is_file()
-    ]
+    verbose = verbose and not quiet
+    language = None
+    if not quiet:
+        mode_str = "🐳 SANDBOX MODE" if sandbox else "📝 IN-PLACE FIX MODE"
+        print(f"🔍 Pactfix - scanning project: {path}")
+        print(f"   {mode_str}\n")
+    
+    # Detect project language (only reported, or needed for the sandbox image)
+    if sandbox or not quiet:
+        language, stats = detect_project_language(path)
+    if not quiet:
+        print(f"📋 Detected project language: {language}")
+        if verbose and stats.get('all_scores'):
+            print(f"   Scores: {stats['all_scores']}")
+        print()
+    
+    # Find all files to process (common build/VCS/dependency directories are skipped)
+    files_to_process = _walk_source_files(path)
     
     if not files_to_process:
-        print(f"⚠️  No files found to analyze in: {path}")
+        if not quiet:
+            print(f"⚠️  No files found to analyze in: {path}")
         return 0
     
-    print(f"📁 Found {len(files_to_process)} files to analyze\n")
+    if not quiet:
+        print(f"📁 Found {len(files_to_process)} files to analyze\n")
     
     # Process files
-    results = []
+    files_analyzed = 0
     fixed_files = {}
     files_modified = []
     total_errors = 0
     total_warnings = 0
     total_fixes = 0
     
-    # Only create .pactfix dir in sandbox mode
+    # .pactfix (report, fixed copies, analysis cache) is only created in sandbox mode
     pactfix_dir = path / '.pactfix' if sandbox else None
-    
-    for file_path in sorted(set(files_to_process)):
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                code = f.read()
+    cache_dir = path / _PROJECT_CACHE_DIR if sandbox and use_cache else None
+    # Per-file report records stream to report.jsonl; only running totals stay in memory
+    if sandbox:
+        _ensure_dir(pactfix_dir)
+    
+    # Analysis fans out to worker processes; all writes stay in this process
+    files_to_process.sort()
+    # The walk built every path by joining onto the root, so the relative path is a slice
+    rel_start = len(os.path.join(os.fspath(path), ''))
+    analyzed = _analyze_paths(files_to_process, comment, jobs, cache_dir, errors='ignore')
+    out: List[str] = []
+    chunk_lines = _output_chunk_lines()
+    with open(pactfix_dir / 'report.jsonl', 'wb') if sandbox else contextlib.nullcontext() as records:
+        for file_path, (result, error, unchanged, _) in zip(files_to_process, analyzed):
+            if error is not None:
+                if verbose:
+                    out.append(f"❌ {file_path}: {error}")
+                continue
+            try:
+                n_errors, n_warnings, n_fixes = len(result.errors), len(result.warnings), len(result.fixes)
+                total_errors += n_errors
+                total_warnings += n_warnings
+                total_fixes += n_fixes
             
-            result = analyze_code(code, str(file_path))
+                rel_path = os.fspath(file_path)[rel_start:]
             
-            if comment and result.fixes:
-                result.fixed_code = add_fix_comments(result)
+                # Save fixed file
+                if not unchanged:
+                    if sandbox:
+                        # Sandbox mode: save to .pactfix/fixed/
+                        fixed_file_path = pactfix_dir / 'fixed' / rel_path
+                        _ensure_dir(fixed_file_path.parent)
+                        fixed_file_path.write_bytes(result.fixed_code.encode('utf-8'))
+                        fixed_files[rel_path] = result.fixed_code
+                    else:
+                        # In-place mode: overwrite original file
+                        file_path.write_bytes(result.fixed_code.encode('utf-8'))
+                        files_modified.append(rel_path)
             
-            total_errors += len(result.errors)
-            total_warnings += len(result.warnings)
-            total_fixes += len(result.fixes)
-            
-            rel_path = file_path.relative_to(path)
+                # Print status
+                if n_errors or (not quiet and (n_fixes or verbose)):
+                    status = _STATUS_OK if not n_errors else _STATUS_FAIL
+                    fix_indicator = " 📝" if n_fixes and not sandbox else ""
+                    out.append(f"{status} {rel_path}: {n_errors}E {n_warnings}W {n_fixes}F [{result.language}]{fix_indicator}")
+                
+                    if verbose:
+                        for err in result.errors:
+                            out.append(f"   ❌ L{err.line}: [{err.code}] {err.message}")
+                        for fix in result.fixes:
+                            out.append(f"   🔧 L{fix.line}: {fix.description}")
             
-            # Save fixed file
-            if result.fixed_code != code:
+                files_analyzed += 1
                 if sandbox:
-                    # Sandbox mode: save to .pactfix/fixed/
-                    fixed_dir = pactfix_dir / 'fixed'
-                    fixed_dir.mkdir(parents=True, exist_ok=True)
-                    fixed_file_path = fixed_dir / rel_path
-                    fixed_file_path.parent.mkdir(parents=True, exist_ok=True)
-                    with open(fixed_file_path, 'w', encoding='utf-8') as f:
-                        f.write(result.fixed_code)
-                    fixed_files[str(rel_path)] = result.fixed_code
-                else:
-                    # In-place mode: overwrite original file
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(result.fixed_code)
-                    files_modified.append(str(rel_path))
-            
-            # Print status
-            status = "✅" if len(result.errors) == 0 else "❌"
+                    records.write(_jsonl_line({
+                        'file': rel_path,
+                        'language': result.language,
+                        'errors': n_errors,
+                        'warnings': n_warnings,
+                        'fixes': n_fixes
+                    }))
             
-            if result.fixes or result.errors or verbose:
-                fix_indicator = " 📝" if result.fixes and not sandbox else ""
-                print(f"{status} {rel_path}: {len(result.errors)}E {len(result.warnings)}W {len(result.fixes)}F [{result.language}]{fix_indicator}")
-                
+            except Exception as e:
                 if verbose:
-                    for err in result.errors:
-                        print(f"   ❌ L{err.line}: [{err.code}] {err.message}")
-                    for fix in result.fixes:
-                        print(f"   🔧 L{fix.line}: {fix.description}")
-            
-            results.append({
-                'file': str(rel_path),
-                'language': result.language,
-                'errors': len(result.errors),
-                'warnings': len(result.warnings),
-                'fixes': len(result.fixes)
-            })
-            
-        except Exception as e:
-            if verbose:
-                print(f"❌ {file_path}: {e}")
+                    out.append(f"❌ {file_path}: {e}")
+            if len(out) >= chunk_lines:
+                _flush_lines(out)
+    _flush_lines(out)
     
     # Print summary
-    print(f"\n{'='*60}")
-    print(f"📊 Project Summary: {path.name}")
-    print(f"   📁 Files analyzed: {len(results)}")
-    print(f"   ❌ Errors:   {total_errors}")
-    print(f"   ⚠️  Warnings: {total_warnings}")
-    print(f"   🔧 Fixes:    {total_fixes}")
-    
-    if not sandbox and files_modified:
-        print(f"\n   � Files modified in place: {len(files_modified)}")
-        for f in files_modified:
-            print(f"      - {f}")
+    if quiet:
+        status = _STATUS_OK if not total_errors else _STATUS_FAIL
+        print(f"{status} {path.name}: {files_analyzed} files, {total_errors} errors, {total_warnings} warnings, "
+              f"{total_fixes} fixes, {len(files_modified) if not sandbox else len(fixed_files)} files fixed")
+    else:
+        print(f"\n{'='*60}")
+        print(f"📊 Project Summary: {path.name}")
+        print(f"   📁 Files analyzed: {files_analyzed}")
+        print(f"   ❌ Errors:   {total_errors}")
+        print(f"   ⚠️  Warnings: {total_warnings}")
+        print(f"   🔧 Fixes:    {total_fixes}")
+        
+        if not sandbox and files_modified:
+            print(f"\n   � Files modified in place: {len(files_modified)}")
+            for f in files_modified:
+                print(f"      - {f}")
     
     # Sandbox mode
     if sandbox:
-        pactfix_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save report
+        # Save report (totals only; schema 2 moved the per-file 'files' list to report.jsonl)
         report_path = pactfix_dir / 'report.json'
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump({
-                'timestamp': datetime.now().isoformat(),
-                'project_path': str(path),
-                'project_language': language,
-                'total_files': len(results),
-                'total_errors': total_errors,
-                'total_warnings': total_warnings,
-                'total_fixes': total_fixes,
-                'comment_mode': comment,
-                'files': results
-            }, f, indent=2, ensure_ascii=False)
+        _write_json(report_path, {
+            'schema_version': 2,
+            'timestamp': datetime.now().isoformat(),
+            'project_path': str(path),
+            'project_language': language,
+            'total_files': files_analyzed,
+            'total_errors': total_errors,
+            'total_warnings': total_warnings,
+            'total_fixes': total_fixes,
+            'comment_mode': comment,
+            'files_report': 'report.jsonl'
+        }, pretty_json)
         
         print(f"\n   📋 Report saved to: {report_path}")
         
@@ -581,7 +883,7 @@ def process_project(project_path: str, comment: bool = False, sandbox: bool = Fa
         print(f"\n{'='*60}")
         print("🐳 Setting up Docker sandbox...")
         
-        sandbox_env = Sandbox(str(path))
+        sandbox_env = Sandbox(str(path), verbose=verbose)
         sandbox_env.setup()
         
         if fixed_files:
@@ -629,8 +931,7 @@ def process_project(project_path: str, comment: bool = False, sandbox: bool = Fa
                 print(f"   📋 Test results saved to: {test_report_path}")
 
         status_path = pactfix_dir / 'sandbox_status.json'
-        with open(status_path, 'w', encoding='utf-8') as f:
-            json.dump(sandbox_status, f, indent=2, ensure_ascii=False)
+        _write_json(status_path, sandbox_status, pretty_json)
         
         print(f"\n✅ Sandbox ready in: {sandbox_env.sandbox_dir}")
         print(f"\nTo run manually:")
@@ -1,10 +1,17 @@
 """Sandbox module - Docker-based isolated environment for testing fixes."""
 
+import hashlib
 import os
+import shlex
 import shutil
 import subprocess
+import sys
+import tempfile
+import time
 import json
+from collections import Counter, deque
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
@@ -12,15 +19,16 @@ from datetime import datetime
 LANGUAGE_DOCKERFILES = {
     'python': '''FROM python:3.11-slim
 WORKDIR /app
-COPY . .
+COPY requirements.txt* ./
 RUN if [ -f "requirements.txt" ]; then pip install --no-cache-dir -r requirements.txt 2>/dev/null || true; fi
+COPY . .
 CMD ["sh", "-c", "python -m pytest -v || python -m unittest discover || python main.py || echo 'No entrypoint found'"]
 ''',
 
     'nodejs': '''FROM node:20-slim
 WORKDIR /app
 COPY package*.json ./
-RUN npm install 2>/dev/null || true
+RUN if [ -f "package-lock.json" ]; then npm ci 2>/dev/null || npm install 2>/dev/null || true; else npm install 2>/dev/null || true; fi
 COPY . .
 CMD ["sh", "-c", "npm test || npm start || node index.js"]
 ''',
@@ -28,7 +36,7 @@ CMD ["sh", "-c", "npm test || npm start || node index.js"]
     'javascript': '''FROM node:20-slim
 WORKDIR /app
 COPY package*.json ./
-RUN npm install 2>/dev/null || true
+RUN if [ -f "package-lock.json" ]; then npm ci 2>/dev/null || npm install 2>/dev/null || true; else npm install 2>/dev/null || true; fi
 COPY . .
 CMD ["sh", "-c", "npm test || npm start || node index.js"]
 ''',
@@ -36,7 +44,7 @@ CMD ["sh", "-c", "npm test || npm start || node index.js"]
     'typescript': '''FROM node:20-slim
 WORKDIR /app
 COPY package*.json ./
-RUN npm install 2>/dev/null || true
+RUN if [ -f "package-lock.json" ]; then npm ci 2>/dev/null || npm install 2>/dev/null || true; else npm install 2>/dev/null || true; fi
 COPY . .
 RUN npm run build 2>/dev/null || npx tsc 2>/dev/null || true
 CMD ["sh", "-c", "npm test || npm start"]
@@ -56,7 +64,7 @@ WORKDIR /app
 COPY Cargo.* ./
 RUN mkdir src && echo "fn main() {}" > src/main.rs && cargo build --release 2>/dev/null || true
 COPY . .
-RUN cargo build --release
+RUN touch src/*.rs 2>/dev/null; cargo build --release
 CMD ["sh", "-c", "cargo test || ./target/release/*"]
 ''',
 
@@ -94,8 +102,8 @@ RUN dotnet build --configuration Release
 CMD ["sh", "-c", "dotnet test || dotnet run"]
 ''',
 
-    'bash': '''FROM ubuntu:22.04
-RUN apt-get update && apt-get install -y bash shellcheck && rm -rf /var/lib/apt/lists/*
+    'bash': '''FROM debian:12-slim
+RUN apt-get update && apt-get install -y --no-install-recommends bash shellcheck && rm -rf /var/lib/apt/lists/* /var/cache/apt/archives/*
 WORKDIR /app
 COPY . .
 RUN chmod +x *.sh 2>/dev/null || true
@@ -152,8 +160,8 @@ COPY . .
 CMD ["sh", "-c", "echo 'Jenkinsfile sandbox ready'"]
 ''',
 
-    'generic': '''FROM ubuntu:22.04
-RUN apt-get update && apt-get install -y build-essential git curl && rm -rf /var/lib/apt/lists/*
+    'generic': '''FROM debian:12-slim
+RUN apt-get update && apt-get install -y --no-install-recommends build-essential && rm -rf /var/lib/apt/lists/* /var/cache/apt/archives/*
 WORKDIR /app
 COPY . .
 CMD ["sh", "-c", "echo 'Generic sandbox - manual testing required'"]
@@ -161,142 +169,273 @@ CMD ["sh", "-c", "echo 'Generic sandbox - manual testing required'"]
 }
 
 
+# Project language -> (marker file names, source extensions); the order breaks score ties
+_LANG_INDICATORS = MappingProxyType({
+    'python': (('requirements.txt', 'setup.py', 'pyproject.toml', 'Pipfile'), ('.py',)),
+    'nodejs': (('package.json',), ('.js', '.mjs')),
+    'typescript': (('tsconfig.json', 'package.json'), ('.ts', '.tsx')),
+    'go': (('go.mod', 'go.sum'), ('.go',)),
+    'rust': (('Cargo.toml', 'Cargo.lock'), ('.rs',)),
+    'java': (('pom.xml', 'build.gradle', 'build.gradle.kts'), ('.java',)),
+    'php': (('composer.json', 'composer.lock'), ('.php',)),
+    'ruby': (('Gemfile', 'Gemfile.lock', 'Rakefile'), ('.rb',)),
+    'csharp': ((), ('.cs', '.csproj', '.sln')),
+    'bash': ((), ('.sh',)),
+    'dockerfile': (('Dockerfile',), ()),
+    'terraform': ((), ('.tf',)),
+    'ansible': (('playbook.yml', 'ansible.cfg', 'inventory'), ()),
+    'json': ((), ('.json', '.jsonc')),
+    'toml': (('pyproject.toml',), ('.toml',)),
+    'ini': (('setup.cfg', 'tox.ini'), ('.ini', '.cfg')),
+    'gitlab-ci': (('.gitlab-ci.yml', '.gitlab-ci.yaml'), ()),
+    'jenkinsfile': (('Jenkinsfile',), ()),
+})
+
+
+def _invert_indicators(position: int) -> Dict[str, Tuple[str, ...]]:
+    """Map each lower-cased marker name (position 0) or extension (1) to its languages, in table order."""
+    table: Dict[str, Tuple[str, ...]] = {}
+    for lang, entries in _LANG_INDICATORS.items():
+        for key in entries[position]:
+            table[key.lower()] = table.get(key.lower(), ()) + (lang,)
+    return table
+
+
+_FILENAME_TO_LANGS = _invert_indicators(0)
+_EXT_TO_LANGS = _invert_indicators(1)
+
+# Never descended into while detecting the project language (hidden directories are skipped as well)
+_IGNORED_DIRS = frozenset({'.git', '.pactfix', '_fixtures', 'node_modules', '__pycache__', 'venv', '.venv',
+                           'target', 'build', 'dist', '.idea', '.vscode', '.tox', '.pytest_cache'})
+# The only hidden files that count towards detection
+_ALLOWED_HIDDEN_FILES = frozenset({'.gitlab-ci.yml', '.gitlab-ci.yaml'})
+# Detection stops once this many files were seen and one language scores twice the runner-up,
+# and after _DETECT_MAX_FILES files in any case; the scores then cover only the scanned part
+_DETECT_SAMPLE_FILES = 5000
+_DETECT_MAX_FILES = 50000
+
+
+# Registry reference for a shared BuildKit layer cache, e.g. registry.local/pactfix-cache:{language}
+_BUILD_CACHE_REF_ENV = 'PACTFIX_BUILD_CACHE_REF'
+
+# Lines of build/run output kept for the returned log
+_OUTPUT_TAIL_LINES = 1024
+
+# Set to 1 to run Python/Node sandboxes straight from the project copy instead of in a container
+_NO_DOCKER_ENV = 'PACTFIX_NO_DOCKER'
+_PYTHON = shlex.quote(sys.executable)
+# Languages that can run without Docker -> test command run in the project copy
+_LOCAL_TEST_COMMANDS = MappingProxyType({
+    'python': f'{_PYTHON} -m pytest -v || {_PYTHON} -m unittest discover',
+    'nodejs': 'npm test',
+    'typescript': 'npm test',
+})
+# The local counterparts of the image's RUN steps (the copy leaves out node_modules) and its CMD.
+# Python uses the host interpreter as it is: nothing is pip-installed into it.
+_NPM_INSTALL = 'if [ -f package-lock.json ]; then npm ci || npm install; else npm install; fi'
+_LOCAL_BUILD_COMMANDS = MappingProxyType({
+    'nodejs': _NPM_INSTALL,
+    'typescript': f'{_NPM_INSTALL} && (npm run build || npx tsc || true)',
+})
+_LOCAL_RUN_COMMANDS = MappingProxyType({
+    'python': f"{_PYTHON} -m pytest -v || {_PYTHON} -m unittest discover || {_PYTHON} main.py || echo 'No entrypoint found'",
+    'nodejs': 'npm test || npm start || node index.js',
+    'typescript': 'npm test || npm start',
+})
+
+# Top-level build manifests that name the project language without walking the tree
+_MARKER_LANGS = MappingProxyType({
+    'pyproject.toml': 'python', 'setup.py': 'python', 'requirements.txt': 'python', 'Pipfile': 'python',
+    'package.json': 'nodejs', 'go.mod': 'go', 'Cargo.toml': 'rust', 'pom.xml': 'java', 'build.gradle': 'java',
+    'build.gradle.kts': 'java', 'composer.json': 'php', 'Gemfile': 'ruby',
+})
+_MANIFEST_LANGS = frozenset(_MARKER_LANGS.values()) | {'typescript'}
+_JS_LANGS = frozenset({'nodejs', 'typescript'})
+
+
+def _marker_language(root: str) -> Optional[str]:
+    """Language named by the top-level manifests, or None when there are none or the top level is mixed."""
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return None
+    found = {_MARKER_LANGS[name] for name in names if name in _MARKER_LANGS}
+    if len(found) != 1:
+        return None
+    lang = found.pop()
+    if lang == 'nodejs' and 'tsconfig.json' in names:
+        lang = 'typescript'
+    # e.g. a package.json for test tooling next to Python sources: let the full scan weigh them
+    compatible = _JS_LANGS if lang in _JS_LANGS else {lang}
+    for name in names:
+        for other in _EXT_TO_LANGS.get(os.path.splitext(name.lower())[1], ()):
+            if other in _MANIFEST_LANGS and other not in compatible:
+                return None
+    return lang
+
+
 def detect_project_language(project_path: Path) -> Tuple[str, Dict]:
-    """Detect the primary language of a project based on files present."""
-    
-    indicators = {
-        'python': {
-            'files': ['requirements.txt', 'setup.py', 'pyproject.toml', 'Pipfile'],
-            'extensions': ['.py'],
-            'weight': 0
-        },
-        'nodejs': {
-            'files': ['package.json'],
-            'extensions': ['.js', '.mjs'],
-            'weight': 0
-        },
-        'typescript': {
-            'files': ['tsconfig.json', 'package.json'],
-            'extensions': ['.ts', '.tsx'],
-            'weight': 0
-        },
-        'go': {
-            'files': ['go.mod', 'go.sum'],
-            'extensions': ['.go'],
-            'weight': 0
-        },
-        'rust': {
-            'files': ['Cargo.toml', 'Cargo.lock'],
-            'extensions': ['.rs'],
-            'weight': 0
-        },
-        'java': {
-            'files': ['pom.xml', 'build.gradle', 'build.gradle.kts'],
-            'extensions': ['.java'],
-            'weight': 0
-        },
-        'php': {
-            'files': ['composer.json', 'composer.lock'],
-            'extensions': ['.php'],
-            'weight': 0
-        },
-        'ruby': {
-            'files': ['Gemfile', 'Gemfile.lock', 'Rakefile'],
-            'extensions': ['.rb'],
-            'weight': 0
-        },
-        'csharp': {
-            'files': [],
-            'extensions': ['.cs', '.csproj', '.sln'],
-            'weight': 0
-        },
-        'bash': {
-            'files': [],
-            'extensions': ['.sh'],
-            'weight': 0
-        },
-        'dockerfile': {
-            'files': ['Dockerfile'],
-            'extensions': [],
-            'weight': 0
-        },
-        'terraform': {
-            'files': [],
-            'extensions': ['.tf'],
-            'weight': 0
-        },
-        'ansible': {
-            'files': ['playbook.yml', 'ansible.cfg', 'inventory'],
-            'extensions': [],
-            'weight': 0
-        },
-        'json': {
-            'files': [],
-            'extensions': ['.json', '.jsonc'],
-            'weight': 0
-        },
-        'toml': {
-            'files': ['pyproject.toml'],
-            'extensions': ['.toml'],
-            'weight': 0
-        },
-        'ini': {
-            'files': ['setup.cfg', 'tox.ini'],
-            'extensions': ['.ini', '.cfg'],
-            'weight': 0
-        },
-        'gitlab-ci': {
-            'files': ['.gitlab-ci.yml', '.gitlab-ci.yaml'],
-            'extensions': [],
-            'weight': 0
-        },
-        'jenkinsfile': {
-            'files': ['Jenkinsfile'],
-            'extensions': [],
-            'weight': 0
-        }
-    }
-    
+    """Detect the primary language of a project based on files present.
+
+    stats['partial'] is True when the tree was not fully scanned: a single top-level manifest
+    decided (file_counts and all_scores are then empty) or the scan stopped after a sample.
+    """
+    # A single unambiguous manifest at the top decides without scanning the tree
+    lang = _marker_language(os.fspath(project_path))
+    if lang is not None:
+        return lang, {'detected_language': lang, 'confidence': 100, 'file_counts': {}, 'all_scores': {},
+                      'partial': True}
+
+    weights: Counter = Counter()
     file_counts = {}
-    
-    allow_hidden_files = {'.gitlab-ci.yml', '.gitlab-ci.yaml'}
-
-    for item in project_path.rglob('*'):
-        if item.is_file() and '_fixtures' not in item.parts and (not any(p.startswith('.') for p in item.parts) or item.name.lower() in allow_hidden_files):
-            ext = item.suffix.lower()
-            name = item.name.lower()
+    scanned = 0
+    partial = False
+
+    stack = [os.fspath(project_path)]
+    while stack:
+        # Enough evidence: a clear leader after a large sample, or the hard cap for huge trees
+        if scanned >= _DETECT_SAMPLE_FILES:
+            top = weights.most_common(2) + [(None, 0)] * 2
+            if scanned >= _DETECT_MAX_FILES or top[0][1] >= 2 * top[1][1]:
+                partial = True
+                break
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _IGNORED_DIRS and not entry.name.startswith('.'):
+                            stack.append(entry.path)
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                name = entry.name.lower()
+                if name.startswith('.') and name not in _ALLOWED_HIDDEN_FILES:
+                    continue
+                scanned += 1
+                ext = os.path.splitext(name)[1]
             
-            for lang, info in indicators.items():
-                if name in [f.lower() for f in info['files']]:
-                    info['weight'] += 10
-                if ext in info['extensions']:
-                    info['weight'] += 1
+                for lang in _FILENAME_TO_LANGS.get(name, ()):
+                    weights[lang] += 10
+                for lang in _EXT_TO_LANGS.get(ext, ()):
+                    weights[lang] += 1
                     file_counts[lang] = file_counts.get(lang, 0) + 1
     
     # TypeScript override - if tsconfig.json exists, prefer TS over JS
-    if indicators['typescript']['weight'] > 0 and indicators['nodejs']['weight'] > 0:
+    if weights['typescript'] > 0 and weights['nodejs'] > 0:
         if (project_path / 'tsconfig.json').exists():
-            indicators['typescript']['weight'] += 20
+            weights['typescript'] += 20
     
-    best_lang = max(indicators.keys(), key=lambda x: indicators[x]['weight'])
+    # max() keeps the first of equal scores, so ties go to the earlier _LANG_INDICATORS entry
+    best_lang = max(_LANG_INDICATORS, key=weights.__getitem__)
     
-    if indicators[best_lang]['weight'] == 0:
+    if weights[best_lang] == 0:
         best_lang = 'generic'
     
     stats = {
         'detected_language': best_lang,
-        'confidence': indicators.get(best_lang, {}).get('weight', 0),
+        'confidence': weights[best_lang],
         'file_counts': file_counts,
-        'all_scores': {k: v['weight'] for k, v in indicators.items() if v['weight'] > 0}
+        'all_scores': {k: weights[k] for k in _LANG_INDICATORS if weights[k] > 0},
+        'partial': partial
     }
     
     return best_lang, stats
 
 
+def _stream_command(cmd, timeout: int, echo: bool = False, **popen_kwargs) -> Tuple[int, str]:
+    """Run cmd with stderr merged into stdout and return (returncode, last lines of output).
+
+    Lines are consumed as they arrive (and echoed live when asked), so only the tail stays in
+    memory. Raises subprocess.TimeoutExpired after killing a process that outlives timeout.
+    """
+    import threading
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                            bufsize=1, errors='replace', **popen_kwargs)
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    tail = deque(maxlen=_OUTPUT_TAIL_LINES)
+    try:
+        for line in proc.stdout:
+            tail.append(line)
+            if echo:
+                print(line, end='', flush=True)
+        proc.wait()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout, output=''.join(tail))
+    return proc.returncode, ''.join(tail)
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    """Replace path with content via a unique sibling temp file, keeping the file's permission bits."""
+    path = Path(path)
+    with tempfile.NamedTemporaryFile('w', dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp',
+                                     delete=False) as tmp:
+        tmp.write(content)
+    try:
+        if path.exists():
+            shutil.copymode(path, tmp.name)
+        else:
+            os.chmod(tmp.name, 0o666 & ~_current_umask())
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+
+def _parallel_copytree(src: Path, dst: Path, ignore=None, copy_function=shutil.copy2) -> None:
+    """shutil.copytree, with the per-file copies spread over a thread pool.
+
+    Directories are created while walking (ignored ones are pruned), then the files are copied
+    concurrently so their read/write syscalls overlap.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    jobs = []
+    for dirpath, dirnames, filenames in os.walk(src, followlinks=True):
+        ignored = ignore(dirpath, dirnames + filenames) if ignore else ()
+        dirnames[:] = [d for d in dirnames if d not in ignored]
+        target = os.path.join(dst, os.path.relpath(dirpath, src))
+        os.makedirs(target, exist_ok=True)
+        jobs.extend((os.path.join(dirpath, name), os.path.join(target, name))
+                    for name in filenames if name not in ignored)
+
+    if not jobs:
+        return
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4, len(jobs))) as ex:
+        for future in [ex.submit(copy_function, src_file, dst_file) for src_file, dst_file in jobs]:
+            future.result()
+
+
 class Sandbox:
     """Docker-based sandbox for running and testing fixed code."""
-    
-    def __init__(self, project_path: str, sandbox_dir: str = None):
+
+    # Whether `docker buildx` is installed; probed once per process
+    _buildx_available: Optional[bool] = None
+
+    def __init__(self, project_path: str, sandbox_dir: str = None, use_docker: Optional[bool] = None,
+                 verbose: bool = False):
         self.project_path = Path(project_path).resolve()
         self.sandbox_dir = Path(sandbox_dir) if sandbox_dir else self.project_path / '.pactfix'
         self.project_copy_dir = self.sandbox_dir / 'project'
@@ -306,7 +445,24 @@ class Sandbox:
         self.last_build_returncode = None
         self.last_run_returncode = None
         self.last_test_returncode = None
+        self.created_at = time.time()
+        if use_docker is None:
+            use_docker = os.environ.get(_NO_DOCKER_ENV, '').strip() != '1'
+        self.use_docker = use_docker
+        # Echo build/run output live instead of only returning its tail
+        self.verbose = verbose
         
+    @property
+    def image_name(self) -> str:
+        """Image tag, unique per project so sandboxes of the same language can build concurrently."""
+        digest = hashlib.sha1(str(self.project_path).encode('utf-8')).hexdigest()[:10]
+        return f'pactfix-sandbox-{self.language}-{digest}'
+
+    @property
+    def runs_locally(self) -> bool:
+        """Whether build/run/test skip Docker and use the host toolchain in the project copy."""
+        return not self.use_docker and self.language in _LOCAL_TEST_COMMANDS
+
     def setup(self) -> bool:
         """Setup the sandbox environment."""
         print(f"🔧 Setting up sandbox in {self.sandbox_dir}")
@@ -323,10 +479,17 @@ class Sandbox:
             '.git', '.pactfix', '_fixtures', 'node_modules', '__pycache__', '*.pyc',
             'venv', '.venv', 'dist', 'build', 'target', '.idea', '.vscode'
         )
-        shutil.copytree(self.project_path, self.project_copy_dir, ignore=ignore)
-
-        # Detect project language
-        self.language, self.stats = detect_project_language(self.project_path)
+        # Real copies: builds and test runs (local mode especially) may write into the copy
+        _parallel_copytree(self.project_path, self.project_copy_dir, ignore=ignore)
+
+        # Detect project language (reused from the previous setup while the tree looks the same)
+        signature = self._tree_signature()
+        cached = self._load_lang_cache(signature)
+        if cached is not None:
+            self.language, self.stats = cached
+        else:
+            self.language, self.stats = detect_project_language(self.project_path)
+            self._store_lang_cache(signature)
         print(f"📋 Detected language: {self.language} (confidence: {self.stats['confidence']})")
 
         # Dockerfile projects have a subject file called Dockerfile; do not use it to build the sandbox image.
@@ -342,8 +505,7 @@ class Sandbox:
 
         # Also place a copy inside the build context for docker-compose compatibility
         dockerfile_in_context = self.project_copy_dir / self.build_dockerfile_name
-        with open(dockerfile_in_context, 'w') as f:
-            f.write(dockerfile_content)
+        _write_atomic(dockerfile_in_context, dockerfile_content)
 
         print(f"✅ Created Dockerfile for {self.language}")
         
@@ -366,7 +528,7 @@ class Sandbox:
             'sandbox_dir': str(self.sandbox_dir),
             'language': self.language,
             'stats': self.stats,
-            'created_at': datetime.now().isoformat()
+            'created_at': datetime.fromtimestamp(self.created_at).isoformat()
         }
         config_path = self.sandbox_dir / 'sandbox.json'
         with open(config_path, 'w') as f:
@@ -374,6 +536,49 @@ class Sandbox:
         
         return True
     
+    def _tree_signature(self) -> List[List]:
+        """mtimes of the project root and its scanned top-level directories.
+
+        Adding, removing or renaming an entry in any of them changes the signature; edits deeper
+        in the tree do not, which is the trade-off for not walking it.
+        """
+        root = os.fspath(self.project_path)
+        signature = [['', os.stat(root).st_mtime_ns]]
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.name in _IGNORED_DIRS or entry.name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        signature.append([entry.name, entry.stat(follow_symlinks=False).st_mtime_ns])
+                except OSError:
+                    continue
+        signature.sort()
+        return signature
+
+    def _load_lang_cache(self, signature: List[List]) -> Optional[Tuple[str, Dict]]:
+        try:
+            with open(self.sandbox_dir / 'lang_cache.json', 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached['project_path'] == str(self.project_path) and cached['signature'] == signature:
+                return cached['language'], cached['stats']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _store_lang_cache(self, signature: List[List]) -> None:
+        cache = {
+            'project_path': str(self.project_path),
+            'signature': signature,
+            'language': self.language,
+            'stats': self.stats,
+        }
+        try:
+            with open(self.sandbox_dir / 'lang_cache.json', 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+        except OSError:
+            pass  # detection simply runs again next time
+
     def _generate_docker_compose(self) -> str:
         """Generate docker-compose.yml for the sandbox."""
         return f'''version: '3.8'
@@ -421,19 +626,16 @@ dist
         """Copy fixed files to sandbox for testing."""
         fixed_dir = self.sandbox_dir / 'fixed'
         fixed_dir.mkdir(parents=True, exist_ok=True)
+        for parent in {Path(rel_path).parent for rel_path in fixed_files}:
+            (fixed_dir / parent).mkdir(parents=True, exist_ok=True)
+            (self.project_copy_dir / parent).mkdir(parents=True, exist_ok=True)
         
         for rel_path, content in fixed_files.items():
             # Keep a copy under .pactfix/fixed
-            fixed_file_path = fixed_dir / rel_path
-            fixed_file_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(fixed_file_path, 'w') as f:
-                f.write(content)
+            _write_atomic(fixed_dir / rel_path, content)
 
             # Apply fixes onto the sandbox project copy used for build/run
-            project_file_path = self.project_copy_dir / rel_path
-            project_file_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(project_file_path, 'w') as f:
-                f.write(content)
+            _write_atomic(self.project_copy_dir / rel_path, content)
 
             print(f"  📄 {rel_path}")
         
@@ -441,25 +643,25 @@ dist
     
     def build(self) -> Tuple[bool, str]:
         """Build the Docker image."""
+        if self.runs_locally:
+            return self._build_locally()
+
         print(f"\n🔨 Building Docker image...")
         
+        # BuildKit with inline cache metadata lets the next build (or another machine that
+        # pulled the image) reuse the dependency layers via --cache-from
+        env = dict(os.environ, DOCKER_BUILDKIT='1')
         try:
-            result = subprocess.run(
-                ['docker', 'build', '-t', f'pactfix-sandbox-{self.language}', 
-                 '-f', str(self.project_copy_dir / self.build_dockerfile_name), str(self.project_copy_dir)],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-
-            self.last_build_returncode = result.returncode
+            returncode, output = _stream_command(self._build_command(), 300, echo=self.verbose, env=env)
+
+            self.last_build_returncode = returncode
             
-            if result.returncode == 0:
+            if returncode == 0:
                 print("✅ Build successful")
-                return True, result.stdout
+                return True, output
             else:
-                print(f"❌ Build failed:\n{result.stderr}")
-                return False, result.stderr
+                print(f"❌ Build failed:\n{output}")
+                return False, output
                 
         except subprocess.TimeoutExpired:
             return False, "Build timeout (5 min)"
@@ -468,6 +670,51 @@ dist
         except Exception as e:
             return False, str(e)
     
+    def _build_locally(self) -> Tuple[bool, str]:
+        """Install dependencies (and compile) in the project copy, as the image's RUN steps would."""
+        print(f"\n⏭️ Local mode: skipping the Docker image build")
+        print("⚠️ Project code will run on the host without isolation (PACTFIX_NO_DOCKER=1)")
+        cmd = _LOCAL_BUILD_COMMANDS.get(self.language)
+        if cmd is None:
+            self.last_build_returncode = 0
+            return True, ''
+        try:
+            returncode, output = _stream_command(cmd, 300, echo=self.verbose, shell=True,
+                                                 cwd=str(self.project_copy_dir))
+            self.last_build_returncode = returncode
+            if returncode == 0:
+                print("✅ Build successful")
+                return True, output
+            print(f"❌ Build failed:\n{output}")
+            return False, output
+        except subprocess.TimeoutExpired:
+            return False, "Build timeout (5 min)"
+        except Exception as e:
+            return False, str(e)
+
+    @classmethod
+    def _has_buildx(cls) -> bool:
+        if cls._buildx_available is None:
+            try:
+                probe = subprocess.run(['docker', 'buildx', 'version'], capture_output=True, timeout=30)
+                cls._buildx_available = probe.returncode == 0
+            except (OSError, subprocess.SubprocessError):
+                cls._buildx_available = False
+        return cls._buildx_available
+
+    def _build_command(self) -> List[str]:
+        """docker build arguments; with PACTFIX_BUILD_CACHE_REF set, layers are cached in that registry."""
+        image = self.image_name
+        context = ['-f', str(self.project_copy_dir / self.build_dockerfile_name), str(self.project_copy_dir)]
+        cache_ref = os.environ.get(_BUILD_CACHE_REF_ENV, '').strip()
+        if cache_ref and self._has_buildx():
+            cache_ref = cache_ref.replace('{language}', self.language)
+            return ['docker', 'buildx', 'build', '--load', '-t', image,
+                    '--cache-from', f'type=registry,ref={cache_ref}',
+                    '--cache-to', f'type=registry,ref={cache_ref},mode=max,image-manifest=true'] + context
+        return ['docker', 'build', '-t', image,
+                '--cache-from', image, '--build-arg', 'BUILDKIT_INLINE_CACHE=1'] + context
+
     def run(self, command: str = None) -> Tuple[bool, str]:
         """Run the sandbox container."""
         print(f"\n🚀 Running sandbox...")
@@ -475,28 +722,25 @@ dist
         output_dir = self.sandbox_dir / 'output'
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        cmd = ['docker', 'run', '--rm', '-v', f'{output_dir}:/output', f'pactfix-sandbox-{self.language}']
-        
-        if command:
-            cmd.extend(['sh', '-c', command])
+        if self.runs_locally:
+            cmd = command or _LOCAL_RUN_COMMANDS[self.language]
+            local = {'shell': True, 'cwd': str(self.project_copy_dir)}
+        else:
+            cmd = ['docker', 'run', '--rm', '-v', f'{output_dir}:/output', self.image_name]
+            if command:
+                cmd.extend(['sh', '-c', command])
+            local = {}
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-
-            self.last_run_returncode = result.returncode
-            
-            output = result.stdout + result.stderr
+            returncode, output = _stream_command(cmd, 120, echo=self.verbose, **local)
+
+            self.last_run_returncode = returncode
             
-            if result.returncode == 0:
+            if returncode == 0:
                 print("✅ Run successful")
                 return True, output
             else:
-                print(f"⚠️ Run finished with code {result.returncode}")
+                print(f"⚠️ Run finished with code {returncode}")
                 return False, output
                 
         except subprocess.TimeoutExpired:
@@ -528,7 +772,10 @@ dist
             'jenkinsfile': "python -c \"p=open('Jenkinsfile','r',encoding='utf-8',errors='ignore').read(); assert '\\t' not in p; assert all(not ln.endswith(' ') for ln in p.splitlines()); assert ':latest' not in p; assert '| bash' not in p; print('JENKINSFILE OK')\"",
         }
         
-        cmd = test_commands.get(self.language, 'echo "No test command for this language"')
+        if self.runs_locally:
+            cmd = _LOCAL_TEST_COMMANDS[self.language]
+        else:
+            cmd = test_commands.get(self.language, 'echo "No test command for this language"')
         ok, out = self.run(cmd)
         self.last_test_returncode = self.last_run_returncode
         return ok, out
@@ -537,15 +784,16 @@ dist
         """Clean up sandbox resources."""
         print(f"\n🧹 Cleaning up...")
         
-        # Remove Docker image
-        try:
-            subprocess.run(
-                ['docker', 'rmi', '-f', f'pactfix-sandbox-{self.language}'],
-                capture_output=True,
-                timeout=30
-            )
-        except:
-            pass
+        # Remove Docker image (local mode never built one)
+        if not self.runs_locally:
+            try:
+                subprocess.run(
+                    ['docker', 'rmi', '-f', self.image_name],
+                    capture_output=True,
+                    timeout=30
+                )
+            except:
+                pass
         
         print("✅ Cleanup complete")
 
@@ -557,8 +805,13 @@ def create_language_dockerfile(language: str, output_dir: Path) -> Path:
     content = LANGUAGE_DOCKERFILES.get(language, LANGUAGE_DOCKERFILES['generic'])
     dockerfile_path = output_dir / f'Dockerfile.{language}'
     
-    with open(dockerfile_path, 'w') as f:
-        f.write(content)
+    # Re-running --init-dockerfiles on the same directory leaves up-to-date files alone
+    try:
+        if dockerfile_path.read_text() == content:
+            return dockerfile_path
+    except OSError:
+        pass
+    dockerfile_path.write_text(content)
     
     return dockerfile_path
 
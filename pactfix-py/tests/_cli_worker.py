@@ -0,0 +1,67 @@
+"""Test-only worker that runs pactfix CLI invocations without a new interpreter per call.
+
+Reads one JSON request per line from stdin ({"args": [...], "cwd": ..., "env": {...}}) and answers
+with one JSON line ({"returncode": ..., "stdout": ..., "stderr": ...}). pactfix is imported once;
+every request then runs `main()` in a forked child, so environment, cwd, module caches and
+file descriptors start from the same clean state as `python -m pactfix` each time.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pactfix.cli import main  # noqa: E402
+
+
+def _child(request, out, err) -> int:
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(out.fileno(), 1)
+    os.dup2(err.fileno(), 2)
+    sys.stdin = open(os.devnull)
+    os.environ.update(request.get('env') or {})
+    os.chdir(request['cwd'])
+    try:
+        code = main(request.get('args') or [])
+    except SystemExit as e:
+        code = e.code
+        if code is not None and not isinstance(code, int):
+            print(code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return code or 0
+
+
+def _run(request) -> dict:
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = _child(request, out, err)
+            finally:
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        out.seek(0)
+        err.seek(0)
+        return {
+            'returncode': os.waitstatus_to_exitcode(status),
+            'stdout': out.read().decode('utf-8', errors='replace'),
+            'stderr': err.read().decode('utf-8', errors='replace'),
+        }
+
+
+if __name__ == '__main__':
+    for line in sys.stdin:
+        if line.strip():
+            sys.stdout.write(json.dumps(_run(json.loads(line))) + '\n')
+            sys.stdout.flush()
@@ -235,6 +235,28 @@ class TestKubernetesAnalysis:
         result = analyze_kubernetes("apiVersion: v1\nkind: Deployment\nspec:\n  template:\n    spec:\n      containers:\n      - image: myapp:latest")
         assert any(w.code == 'K8S004' for w in result.warnings)
 
+    def test_multi_document_kinds(self):
+        code = "# bundle\n---\napiVersion: v1\nkind: Service\n---\napiVersion: v1\nkind: ConfigMap\n...\n"
+        assert analyze_kubernetes(code).context['kinds'] == ['Service', 'ConfigMap']
+        assert analyze_kubernetes(code.replace('...\n', '')).context['kinds'] == ['Service', 'ConfigMap']
+
+    def test_non_pod_kinds_skip_container_checks(self):
+        result = analyze_kubernetes("apiVersion: v1\nkind: Service\nspec:\n  containers:\n  - image: nginx\n---\nkind: [Pod]\n")
+        assert not any(w.code == 'K8S004' for w in result.warnings)
+
+    def test_tab_continued_text_is_invalid_yaml(self):
+        result = analyze_kubernetes("another = test   \n\twith_tab = 1\n")
+        assert [e.code for e in result.errors] == ['K8S999']
+
+    def test_scalar_metadata_and_spec_are_skipped(self):
+        result = analyze_kubernetes("apiVersion: apps/v1\nkind: Deployment\nmetadata: web\nspec:\n  template: none\n")
+        assert result.errors == []
+
+    def test_secret_reported_once_per_line_in_multi_document(self):
+        code = "apiVersion: v1\nkind: Pod\nspec:\n  containers:\n  - env:\n    - name: DB_PASSWORD\n      value: supersecret\n---\napiVersion: v1\nkind: Service\n"
+        secrets = [e.line for e in analyze_kubernetes(code).errors if e.code == 'K8S006']
+        assert secrets == [7]
+
 
 class TestIntegration:
     def test_analyze_code_auto_detect(self):
@@ -254,6 +276,15 @@ class TestIntegration:
         assert 'warnings' in d
         assert 'fixes' in d
 
+    def test_repeated_analysis_returns_independent_results(self):
+        code = "#!/bin/bash\ncd /tmp"
+        first = analyze_code(code)
+        first.fixed_code = 'mutated'
+        first.warnings.clear()
+        second = analyze_code(code)
+        assert second.fixed_code == "#!/bin/bash\ncd /tmp || exit 1"
+        assert len(second.warnings) > 0
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
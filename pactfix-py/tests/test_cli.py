@@ -7,24 +7,55 @@ import json
 import os
 import subprocess
 import sys
+from collections import ChainMap
 from pathlib import Path
+from types import MappingProxyType
 
+import pytest
 
-def _run_cli(args, cwd, env=None):
-    merged_env = os.environ.copy()
-    if env:
-        merged_env.update(env)
+# Environment every spawned CLI starts from; tests layer their overrides on top
+_BASE_ENV = MappingProxyType(os.environ.copy())
+# tests/_cli_worker.py process shared by the module's CLI tests (PACTFIX_NO_DAEMON=1 disables it)
+_SERVER = None
 
+
+@pytest.fixture(scope="session")
+def cli_cwd():
+    return Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cli_server(cli_cwd):
+    global _SERVER
+    if _BASE_ENV.get("PACTFIX_NO_DAEMON") == "1" or not hasattr(os, "fork"):
+        yield None
+        return
+    worker = Path(__file__).with_name("_cli_worker.py")
+    _SERVER = subprocess.Popen([sys.executable, str(worker)], cwd=str(cli_cwd),
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    yield _SERVER
+    _SERVER.stdin.close()
+    _SERVER.wait(timeout=30)
+    _SERVER = None
+
+
+def _run_cli(args, cwd, env=None, spawn=False):
+    """Run the CLI through the shared worker, or as a real `python -m pactfix` process with spawn=True."""
     cmd = [sys.executable, "-m", "pactfix"] + args
-    proc = subprocess.run(cmd, cwd=str(cwd), env=merged_env, capture_output=True, text=True)
-    return proc
+    if _SERVER is not None and not spawn:
+        _SERVER.stdin.write(json.dumps({"args": args, "cwd": str(cwd), "env": env or {}}) + "\n")
+        _SERVER.stdin.flush()
+        reply = json.loads(_SERVER.stdout.readline())
+        return subprocess.CompletedProcess(cmd, reply["returncode"], reply["stdout"], reply["stderr"])
 
+    return subprocess.run(cmd, cwd=str(cwd), env=dict(ChainMap(env or {}, _BASE_ENV)), capture_output=True, text=True)
 
-def test_cli_json_output(tmp_path):
+
+def test_cli_json_output(tmp_path, cli_cwd):
     sample = tmp_path / "test.sql"
     sample.write_text("SELECT * FROM users", encoding="utf-8")
 
-    proc = _run_cli([str(sample), "--json"], cwd=Path(__file__).resolve().parents[1])
+    proc = _run_cli([str(sample), "--json"], cwd=cli_cwd, spawn=True)
     assert proc.returncode == 0
 
     data = json.loads(proc.stdout)
@@ -32,14 +63,389 @@ def test_cli_json_output(tmp_path):
     assert any(w["code"] == "SQL001" for w in data["warnings"])
 
 
-def test_cli_fix_all_uses_env_examples_dir(tmp_path):
+def test_cli_routes_generic_yaml_manifest_to_kubernetes(tmp_path, cli_cwd):
+    sample = tmp_path / "app.yaml"
+    sample.write_text(
+        "apiVersion: v1\nkind: Pod\nmetadata:\n  name: web\nspec:\n  containers:\n  - name: web\n    image: nginx\n",
+        encoding="utf-8",
+    )
+
+    proc = _run_cli([str(sample), "--json"], cwd=cli_cwd)
+    data = json.loads(proc.stdout)
+    assert data["language"] == "kubernetes"
+    assert any(w["code"] == "K8S004" for w in data["warnings"])
+
+
+def test_batch_and_path_route_generic_yaml_manifest_to_kubernetes(tmp_path, cli_cwd):
+    (tmp_path / "app.yaml").write_text(
+        "apiVersion: v1\nkind: Pod\nmetadata:\n  name: web\nspec:\n  containers:\n  - name: web\n    image: nginx\n",
+        encoding="utf-8",
+    )
+
+    batch = _run_cli(["--batch", str(tmp_path)], cwd=cli_cwd)
+    assert "app.yaml" in batch.stdout and "[kubernetes]" in batch.stdout
+
+    project = _run_cli(["--path", str(tmp_path), "--verbose"], cwd=cli_cwd)
+    assert "[kubernetes]" in project.stdout
+
+
+def test_cli_import_does_not_load_analyzers(cli_cwd):
+    code = "import sys, pactfix.cli; print('pactfix.analyzer' in sys.modules, 'pactfix.sandbox' in sys.modules)"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=str(cli_cwd),
+                          capture_output=True, text=True)
+    assert proc.stdout.strip() == "False False"
+
+
+def test_cli_rejects_unknown_language(tmp_path, cli_cwd):
+    sample = tmp_path / "test.sql"
+    sample.write_text("SELECT 1", encoding="utf-8")
+
+    proc = _run_cli([str(sample), "-l", "cobol"], cwd=cli_cwd)
+    assert proc.returncode == 2
+    assert "invalid choice: 'cobol'" in proc.stderr
+
+
+def test_write_json_matches_stdlib_layout(tmp_path, monkeypatch):
+    from pactfix import cli
+
+    data = {"file": "zażółć.sh", "counts": [1, 2], "nested": {"ok": True, "none": None}}
+    expected = json.dumps(data, indent=2, ensure_ascii=False)
+
+    cli._write_json(tmp_path / "fast.json", data)
+    monkeypatch.setattr(cli, "orjson", None)
+    cli._write_json(tmp_path / "plain.json", data)
+
+    assert (tmp_path / "fast.json").read_text(encoding="utf-8") == expected
+    assert (tmp_path / "plain.json").read_text(encoding="utf-8") == expected
+    assert cli._dumps(data) == expected
+
+
+def test_cli_log_file_is_compact_unless_pretty_json(tmp_path, cli_cwd):
+    sample = tmp_path / "test.sh"
+    sample.write_text("#!/bin/bash\necho $1\n", encoding="utf-8")
+
+    compact = tmp_path / "compact.json"
+    _run_cli([str(sample), "--log-file", str(compact)], cwd=cli_cwd)
+    pretty = tmp_path / "pretty.json"
+    _run_cli([str(sample), "--log-file", str(pretty), "--pretty-json"], cwd=cli_cwd)
+
+    assert "\n" not in compact.read_text(encoding="utf-8")
+    assert pretty.read_text(encoding="utf-8").startswith("{\n  ")
+    assert json.loads(compact.read_text(encoding="utf-8"))["result"] == json.loads(pretty.read_text(encoding="utf-8"))["result"]
+
+
+def test_walk_source_files_prunes_excluded_dirs(tmp_path):
+    from pactfix import cli
+
+    root = tmp_path / "build" / "proj"
+    for rel in ("app.py", "src/Dockerfile", "node_modules/lib/x.js", ".git/hooks/pre-commit.sh", "notes.txt"):
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text("x\n", encoding="utf-8")
+
+    found = sorted(p.relative_to(root).as_posix() for p in cli._walk_source_files(root))
+    assert found == ["app.py", "src/Dockerfile"]
+
+
+def test_detect_project_language_skips_ignored_dirs(tmp_path):
+    from pactfix.sandbox import detect_project_language
+
+    (tmp_path / "main.py").write_text("print(1)\n", encoding="utf-8")
+    # A marker below the top level does not take the manifest fast path
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "requirements.txt").write_text("", encoding="utf-8")
+    for rel in ("node_modules/a/x.js", "node_modules/a/y.js", ".hidden/z.js", "build/w.js"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("x\n", encoding="utf-8")
+    (tmp_path / ".gitlab-ci.yml").write_text("stages: []\n", encoding="utf-8")
+
+    language, stats = detect_project_language(tmp_path)
+    assert language == "python"
+    assert stats["file_counts"] == {"python": 1}
+    assert stats["all_scores"]["gitlab-ci"] == 10
+
+
+def test_detect_project_language_uses_unambiguous_manifest(tmp_path):
+    from pactfix.sandbox import detect_project_language
+
+    (tmp_path / "go.mod").write_text("module x\n", encoding="utf-8")
+    (tmp_path / "main.go").write_text("package main\n", encoding="utf-8")
+    (tmp_path / "scripts").mkdir()
+    for i in range(20):
+        (tmp_path / "scripts" / f"s{i}.py").write_text("print(1)\n", encoding="utf-8")
+    language, stats = detect_project_language(tmp_path)
+    assert language == "go"
+    assert stats["file_counts"] == {}
+    assert stats["partial"] is True
+
+    # Sources of another manifest language at the top fall back to scoring the whole tree
+    (tmp_path / "tool.py").write_text("print(1)\n", encoding="utf-8")
+    language, stats = detect_project_language(tmp_path)
+    assert language == "python"
+    assert stats["file_counts"]["python"] == 21
+    assert stats["partial"] is False
+
+
+def test_detect_project_language_stops_once_evidence_is_clear(tmp_path, monkeypatch):
+    from pactfix import sandbox as sandbox_mod
+
+    for d in range(5):
+        (tmp_path / f"pkg{d}").mkdir()
+        for i in range(10):
+            (tmp_path / f"pkg{d}" / f"m{i}.py").write_text("", encoding="utf-8")
+    monkeypatch.setattr(sandbox_mod, "_DETECT_SAMPLE_FILES", 10)
+
+    language, stats = sandbox_mod.detect_project_language(tmp_path)
+    assert language == "python"
+    assert stats["file_counts"]["python"] < 50
+    assert stats["partial"] is True
+
+
+def test_sandbox_resolves_relative_paths_against_the_current_cwd(tmp_path, monkeypatch):
+    from pactfix.sandbox import Sandbox
+
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    monkeypatch.chdir(tmp_path / "a")
+    assert Sandbox(".").project_path == (tmp_path / "a").resolve()
+    monkeypatch.chdir(tmp_path / "b")
+    assert Sandbox(".").project_path == (tmp_path / "b").resolve()
+
+
+def test_sandbox_setup_reuses_detected_language(tmp_path, capsys):
+    from pactfix.sandbox import Sandbox
+
+    (tmp_path / "main.py").write_text("print(1)\n", encoding="utf-8")
+    Sandbox(str(tmp_path)).setup()
+    cache_path = tmp_path / ".pactfix" / "lang_cache.json"
+    cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    assert cache["language"] == "python"
+
+    cache["language"] = "ruby"
+    cache_path.write_text(json.dumps(cache), encoding="utf-8")
+    sandbox = Sandbox(str(tmp_path))
+    sandbox.setup()
+    assert sandbox.language == "ruby"
+
+    # A new top-level entry invalidates the cached result
+    (tmp_path / "go.mod").write_text("module x\n", encoding="utf-8")
+    sandbox = Sandbox(str(tmp_path))
+    sandbox.setup()
+    assert sandbox.language == "go"
+
+
+def test_sandbox_copy_writes_never_reach_the_project(tmp_path, capsys):
+    from pactfix.sandbox import Sandbox
+
+    (tmp_path / "main.py").write_text("print(1)\n", encoding="utf-8")
+    (tmp_path / "requirements.txt").write_text("", encoding="utf-8")
+    (tmp_path / "Dockerfile").write_text("FROM scratch\n", encoding="utf-8")
+
+    sandbox = Sandbox(str(tmp_path))
+    sandbox.setup()
+    sandbox.copy_fixed_files({"main.py": "print(2)\n"})
+
+    assert (tmp_path / "main.py").read_text(encoding="utf-8") == "print(1)\n"
+    assert (tmp_path / "Dockerfile").read_text(encoding="utf-8") == "FROM scratch\n"
+    assert (sandbox.project_copy_dir / "main.py").read_text(encoding="utf-8") == "print(2)\n"
+    assert (sandbox.project_copy_dir / "Dockerfile").read_text(encoding="utf-8").startswith("FROM python")
+
+
+def test_sandbox_test_run_writes_never_reach_the_project(tmp_path, capsys):
+    from pactfix.sandbox import Sandbox
+
+    (tmp_path / "requirements.txt").write_text("", encoding="utf-8")
+    (tmp_path / "data.txt").write_text("original\n", encoding="utf-8")
+    (tmp_path / "test_write.py").write_text(
+        "def test_write():\n    with open('data.txt', 'a') as f:\n        f.write('changed\\n')\n", encoding="utf-8")
+
+    sandbox = Sandbox(str(tmp_path), use_docker=False)
+    sandbox.setup()
+    ok, output = sandbox.test()
+    assert ok, output
+
+    assert (tmp_path / "data.txt").read_text(encoding="utf-8") == "original\n"
+    assert (tmp_path / "data.txt").stat().st_nlink == 1
+    assert (sandbox.project_copy_dir / "data.txt").read_text(encoding="utf-8") == "original\nchanged\n"
+
+
+def test_sandbox_fixed_files_keep_their_permission_bits(tmp_path, capsys):
+    from pactfix.sandbox import Sandbox
+
+    script = tmp_path / "run.sh"
+    script.write_text("#!/bin/bash\necho $1\n", encoding="utf-8")
+    script.chmod(0o755)
+
+    sandbox = Sandbox(str(tmp_path))
+    sandbox.setup()
+    sandbox.copy_fixed_files({"run.sh": "#!/bin/bash\necho \"$1\"\n"})
+
+    copied = sandbox.project_copy_dir / "run.sh"
+    assert copied.read_text(encoding="utf-8") == "#!/bin/bash\necho \"$1\"\n"
+    assert copied.stat().st_mode & 0o777 == 0o755
+    assert (sandbox.sandbox_dir / "fixed" / "run.sh").stat().st_mode & 0o600 == 0o600
+    assert not list(sandbox.project_copy_dir.glob("*.tmp"))
+
+
+def test_sandbox_dockerfiles_install_dependencies_before_copying_sources():
+    from pactfix.sandbox import LANGUAGE_DOCKERFILES
+
+    for language, install in (("python", "pip install"), ("nodejs", "npm "), ("rust", "cargo build")):
+        content = LANGUAGE_DOCKERFILES[language]
+        assert content.index(install) < content.index("COPY . ."), language
+
+
+def test_sandbox_build_uses_registry_cache_when_configured(tmp_path, monkeypatch):
+    from pactfix.sandbox import Sandbox
+
+    sandbox = Sandbox(str(tmp_path))
+    sandbox.language = "python"
+    assert sandbox._build_command()[:2] == ["docker", "build"]
+
+    monkeypatch.setenv("PACTFIX_BUILD_CACHE_REF", "registry.local/cache:{language}")
+    monkeypatch.setattr(Sandbox, "_buildx_available", True)
+    cmd = sandbox._build_command()
+    assert cmd[:3] == ["docker", "buildx", "build"]
+    assert "type=registry,ref=registry.local/cache:python" in cmd
+
+    monkeypatch.setattr(Sandbox, "_buildx_available", False)
+    assert sandbox._build_command()[:2] == ["docker", "build"]
+
+
+def test_sandbox_image_tag_is_unique_per_project(tmp_path):
+    from pactfix.sandbox import Sandbox
+
+    sandboxes = []
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        sandbox = Sandbox(str(tmp_path / name))
+        sandbox.language = "python"
+        sandboxes.append(sandbox)
+
+    tags = [sandbox.image_name for sandbox in sandboxes]
+    assert all(tag.startswith("pactfix-sandbox-python-") for tag in tags)
+    assert tags[0] != tags[1]
+
+
+def test_sandbox_local_mode_runs_tests_without_docker(tmp_path, monkeypatch, capsys):
+    from pactfix.sandbox import Sandbox
+
+    (tmp_path / "test_ok.py").write_text("def test_ok():\n    assert True\n", encoding="utf-8")
+    (tmp_path / "requirements.txt").write_text("", encoding="utf-8")
+    monkeypatch.setenv("PACTFIX_NO_DOCKER", "1")
+
+    sandbox = Sandbox(str(tmp_path))
+    sandbox.setup()
+    assert sandbox.runs_locally
+    assert sandbox.build() == (True, "")
+    ok, output = sandbox.test()
+    assert ok, output
+    assert sandbox.last_test_returncode == 0
+    assert "1 passed" in output
+
+
+def test_sandbox_local_mode_installs_node_dependencies(tmp_path, monkeypatch, capsys):
+    from pactfix.sandbox import Sandbox
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    npm = bin_dir / "npm"
+    npm.write_text('#!/bin/sh\necho "npm $*"\n[ "$1" = ci ] && mkdir -p node_modules\nexit 0\n', encoding="utf-8")
+    npm.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("PACTFIX_NO_DOCKER", "1")
+    project = tmp_path / "app"
+    project.mkdir()
+    (project / "package.json").write_text('{"name": "app"}', encoding="utf-8")
+    (project / "package-lock.json").write_text("{}", encoding="utf-8")
+    (project / "index.js").write_text("console.log(1)\n", encoding="utf-8")
+
+    sandbox = Sandbox(str(project))
+    sandbox.setup()
+    assert sandbox.runs_locally
+    ok, output = sandbox.build()
+    assert ok and "npm ci" in output
+    assert (sandbox.project_copy_dir / "node_modules").is_dir()
+    assert not (project / "node_modules").exists()
+    # Without a command, run() keeps the image CMD's meaning: test, then start
+    ok, output = sandbox.run()
+    assert ok and output.strip() == "npm test"
+
+
+def test_sandbox_stream_command_keeps_output_tail_and_enforces_timeout():
+    from pactfix.sandbox import _OUTPUT_TAIL_LINES, _stream_command
+
+    code = "import sys\nfor i in range(3000): print(i)\nprint('err', file=sys.stderr)"
+    returncode, output = _stream_command([sys.executable, "-c", code], 30)
+    lines = output.splitlines()
+    assert returncode == 0
+    assert len(lines) == _OUTPUT_TAIL_LINES
+    assert lines[-1] == "err"
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        _stream_command([sys.executable, "-c", "import time; time.sleep(30)"], 0.5)
+
+
+def test_create_language_dockerfile_skips_up_to_date_file(tmp_path):
+    from pactfix.sandbox import LANGUAGE_DOCKERFILES, create_language_dockerfile
+
+    path = create_language_dockerfile("go", tmp_path)
+    assert path.read_text() == LANGUAGE_DOCKERFILES["go"]
+    os.utime(path, ns=(0, 0))
+    create_language_dockerfile("go", tmp_path)
+    assert path.stat().st_mtime_ns == 0
+
+    path.write_text("FROM scratch\n")
+    create_language_dockerfile("go", tmp_path)
+    assert path.read_text() == LANGUAGE_DOCKERFILES["go"]
+
+
+def test_batch_output_is_identical_with_worker_pool(tmp_path, monkeypatch, capsys):
+    from pactfix import cli
+
+    for i in range(4):
+        (tmp_path / f"s{i}.sh").write_text(f"#!/bin/bash\necho $VAR{i}\n", encoding="utf-8")
+        (tmp_path / f"q{i}.sql").write_text("SELECT * FROM users", encoding="utf-8")
+
+    cli.process_batch(str(tmp_path), verbose=True, jobs=1)
+    serial = capsys.readouterr().out
+
+    monkeypatch.setattr(cli, "_PARALLEL_MIN_FILES", 1)
+    cli.process_batch(str(tmp_path), verbose=True, jobs=2)
+    assert capsys.readouterr().out == serial
+
+
+def test_project_in_place_fixes_are_identical_with_worker_pool(tmp_path, monkeypatch, capsys):
+    from pactfix import cli
+
+    trees = []
+    for name in ("serial", "pool"):
+        root = tmp_path / name
+        root.mkdir()
+        for i in range(3):
+            (root / f"s{i}.sh").write_text(f"#!/bin/bash\necho $VAR{i}\n", encoding="utf-8")
+        (root / "crlf.sh").write_bytes(b"x=1\r\n")
+        trees.append(root)
+
+    cli.process_project(str(trees[0]), jobs=1)
+    serial = capsys.readouterr().out.replace("serial", "TREE")
+    monkeypatch.setattr(cli, "_PARALLEL_MIN_FILES", 1)
+    cli.process_project(str(trees[1]), jobs=2)
+    assert capsys.readouterr().out.replace("pool", "TREE") == serial
+
+    for f in trees[0].glob("*.sh"):
+        assert (trees[1] / f.name).read_bytes() == f.read_bytes()
+    # Files without fixes are left alone, line endings included
+    assert (trees[1] / "crlf.sh").read_bytes() == b"x=1\r\n"
+
+
+def test_cli_fix_all_uses_env_examples_dir(tmp_path, cli_cwd):
     # Create fake examples structure
     examples = tmp_path / "examples"
     (examples / "bash").mkdir(parents=True)
     (examples / "bash" / "faulty.sh").write_text("#!/bin/bash\ncd /tmp", encoding="utf-8")
 
     env = {"PACTFIX_EXAMPLES_DIR": str(examples)}
-    proc = _run_cli(["--fix-all"], cwd=Path(__file__).resolve().parents[1], env=env)
+    proc = _run_cli(["--fix-all"], cwd=cli_cwd, env=env)
     assert proc.returncode == 0
 
     fixed = examples / "bash" / "fixed" / "fixed_faulty.sh"
@@ -52,12 +458,129 @@ def test_cli_fix_all_uses_env_examples_dir(tmp_path):
     assert summary_data["total_files"] >= 1
 
 
-def test_cli_comment_inserts_comment_into_output_file(tmp_path):
+def test_cli_fix_all_reuses_cached_results(tmp_path, cli_cwd):
+    examples = tmp_path / "examples"
+    (examples / "bash").mkdir(parents=True)
+    (examples / "bash" / "faulty.sh").write_text("#!/bin/bash\ncd /tmp", encoding="utf-8")
+
+    env = {"PACTFIX_EXAMPLES_DIR": str(examples)}
+    first = _run_cli(["--fix-all", "-v"], cwd=cli_cwd, env=env)
+    cached = list((examples / ".pactfix_cache").rglob("*.json"))
+    assert len(cached) == 1
+
+    second = _run_cli(["--fix-all", "-v"], cwd=cli_cwd, env=env)
+    assert second.stdout == first.stdout
+    # A tampered entry is served on the next run, proving the analyzer was skipped
+    entry = json.loads(cached[0].read_text(encoding="utf-8"))
+    entry["fixedCode"] = "echo cached"
+    cached[0].write_text(json.dumps(entry), encoding="utf-8")
+    _run_cli(["--fix-all", "--force"], cwd=cli_cwd, env=env)
+    assert (examples / "bash" / "fixed" / "fixed_faulty.sh").read_text(encoding="utf-8") == "echo cached"
+
+    _run_cli(["--fix-all", "--force", "--no-cache"], cwd=cli_cwd, env=env)
+    assert "cd /tmp" in (examples / "bash" / "fixed" / "fixed_faulty.sh").read_text(encoding="utf-8")
+
+
+def test_project_reuses_cached_results(tmp_path, monkeypatch, capsys):
+    from pactfix import cli
+    from pactfix.sandbox import Sandbox
+
+    monkeypatch.setattr(Sandbox, "build", lambda self: (False, "no docker in tests"))
+    (tmp_path / "ok.sh").write_text("#!/bin/bash\necho ok\n", encoding="utf-8")
+    cli.process_project(str(tmp_path), sandbox=True, verbose=True)
+    cached = list((tmp_path / ".pactfix" / "cache").rglob("*.json"))
+    assert len(cached) == 1
+
+    entry = json.loads(cached[0].read_text(encoding="utf-8"))
+    entry["language"] = "cached"
+    cached[0].write_text(json.dumps(entry), encoding="utf-8")
+    capsys.readouterr()
+    cli.process_project(str(tmp_path), sandbox=True, verbose=True)
+    assert "[cached]" in capsys.readouterr().out
+
+    cli.process_project(str(tmp_path), sandbox=True, verbose=True, use_cache=False)
+    assert "[bash]" in capsys.readouterr().out
+
+
+def test_project_report_lists_files(tmp_path, monkeypatch, capsys):
+    from pactfix import cli
+    from pactfix.sandbox import Sandbox
+
+    monkeypatch.setattr(Sandbox, "build", lambda self: (False, "no docker in tests"))
+    (tmp_path / "ok.sh").write_text("#!/bin/bash\necho $1\n", encoding="utf-8")
+    cli.process_project(str(tmp_path), sandbox=True)
+    report = json.loads((tmp_path / ".pactfix" / "report.json").read_text(encoding="utf-8"))
+    assert report["schema_version"] == 2
+    assert report["total_files"] == 1 and "files" not in report
+    lines = (tmp_path / ".pactfix" / report["files_report"]).read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["file"] for line in lines] == ["ok.sh"]
+
+
+def test_project_in_place_run_creates_no_pactfix_dir(tmp_path, capsys):
+    from pactfix import cli
+
+    (tmp_path / "ok.sh").write_text("#!/bin/bash\necho $1\n", encoding="utf-8")
+    cli.process_project(str(tmp_path), verbose=True)
+    assert not (tmp_path / ".pactfix").exists()
+
+
+def test_project_quiet_lists_only_files_with_errors(tmp_path, capsys):
+    from pactfix import cli
+
+    (tmp_path / "ok.sh").write_text("#!/bin/bash\necho ok\n", encoding="utf-8")
+    (tmp_path / "bad.php").write_text("<?php\nextract($_GET);\n", encoding="utf-8")
+
+    assert cli.process_project(str(tmp_path), quiet=True, use_cache=False) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith("❌ bad.php:")
+    assert lines[1].startswith(f"❌ {tmp_path.name}: 2 files, ")
+
+
+def test_cli_fix_all_skips_up_to_date_outputs(tmp_path, cli_cwd):
+    examples = tmp_path / "examples"
+    (examples / "bash").mkdir(parents=True)
+    source = examples / "bash" / "faulty.sh"
+    source.write_text("#!/bin/bash\ncd /tmp", encoding="utf-8")
+
+    env = {"PACTFIX_EXAMPLES_DIR": str(examples)}
+    first = _run_cli(["--fix-all", "-v", "--no-cache"], cwd=cli_cwd, env=env)
+
+    fixed = examples / "bash" / "fixed" / "fixed_faulty.sh"
+    fixed.write_text("untouched", encoding="utf-8")
+    second = _run_cli(["--fix-all", "-v", "--no-cache"], cwd=cli_cwd, env=env)
+    assert second.stdout == first.stdout
+    assert fixed.read_text(encoding="utf-8") == "untouched"
+
+    # A newer source (or --comment, which the log records) makes the output stale again
+    os.utime(source, ns=(fixed.stat().st_mtime_ns + 10**9,) * 2)
+    _run_cli(["--fix-all", "--no-cache"], cwd=cli_cwd, env=env)
+    assert "cd /tmp" in fixed.read_text(encoding="utf-8")
+
+    fixed.write_text("untouched", encoding="utf-8")
+    _run_cli(["--fix-all", "--no-cache", "--comment"], cwd=cli_cwd, env=env)
+    assert "# pactfix:" in fixed.read_text(encoding="utf-8")
+
+
+def test_cli_fix_all_normalizes_newlines_of_unchanged_files(tmp_path, cli_cwd):
+    examples = tmp_path / "examples"
+    (examples / "sql").mkdir(parents=True)
+    (examples / "sql" / "crlf.sql").write_bytes(b"SELECT id FROM t;\r\n")
+    (examples / "sql" / "lf.sql").write_bytes(b"SELECT id FROM t;\n")
+
+    _run_cli(["--fix-all"], cwd=cli_cwd, env={"PACTFIX_EXAMPLES_DIR": str(examples)})
+
+    fixed = examples / "sql" / "fixed"
+    assert (fixed / "fixed_crlf.sql").read_bytes() == b"SELECT id FROM t;\n"
+    assert (fixed / "fixed_lf.sql").read_bytes() == b"SELECT id FROM t;\n"
+
+
+def test_cli_comment_inserts_comment_into_output_file(tmp_path, cli_cwd):
     sample = tmp_path / "test.sh"
     sample.write_text("cd /tmp\n", encoding="utf-8")
 
     out = tmp_path / "out.sh"
-    proc = _run_cli([str(sample), "-o", str(out), "--comment"], cwd=Path(__file__).resolve().parents[1])
+    proc = _run_cli([str(sample), "-o", str(out), "--comment"], cwd=cli_cwd)
     assert proc.returncode == 0
 
     text = out.read_text(encoding="utf-8")
@@ -7,8 +7,11 @@ Tests 100+ error types across 24 different technologies/DSLs
 import json
 import os
 import sys
+import time
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
+from types import SimpleNamespace
 from dataclasses import dataclass, field, asdict
 from typing import List, Dict, Any, Optional
 
@@ -118,16 +121,44 @@ FIXTURE_FILES = {
     'jenkinsfile': 'jenkinsfile/Jenkinsfile',
 }
 
+# (language, fixture file, expected minimum issues) for the pytest matrix and the standalone runner
+_LANG_PARAMS = tuple(
+    (language, fixture_file, EXPECTED_ISSUES.get(language, 3))
+    for language, fixture_file in FIXTURE_FILES.items()
+)
+
+
+_FIXTURES_DIR = (Path(__file__).parent / 'fixtures').resolve()
+_RESOLVED_PATHS = {language: _FIXTURES_DIR / fixture_file for language, fixture_file in FIXTURE_FILES.items()}
+
 
 def get_fixtures_dir() -> Path:
     """Get the fixtures directory path."""
-    return Path(__file__).parent / 'fixtures'
+    return _FIXTURES_DIR
+
+
+def _fixture_path(language: str, fixture_file: str) -> Path:
+    """Path of a fixture, precomputed for the FIXTURE_FILES entries."""
+    if FIXTURE_FILES.get(language) == fixture_file:
+        return _RESOLVED_PATHS[language]
+    return _FIXTURES_DIR / fixture_file
+
+
+@lru_cache(maxsize=None)
+def _read_fixture(path: str) -> str:
+    """Fixture text, read from disk once per process."""
+    return Path(path).read_bytes().decode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def _analyze_cached(path: str, language: str):
+    """analyze_code() of a fixture, shared by the language and fix-comment checks."""
+    return analyze_code(_read_fixture(path), path, language)
 
 
 def run_language_check(language: str, fixture_file: str, expected_min: int) -> TestResult:
     """Test a single language fixture."""
-    fixtures_dir = get_fixtures_dir()
-    file_path = fixtures_dir / fixture_file
+    file_path = _fixture_path(language, fixture_file)
     
     if not file_path.exists():
         return TestResult(
@@ -142,8 +173,7 @@ def run_language_check(language: str, fixture_file: str, expected_min: int) -> T
         )
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            code = f.read()
+        code = _read_fixture(str(file_path))
     except Exception as e:
         return TestResult(
             language=language,
@@ -157,8 +187,12 @@ def run_language_check(language: str, fixture_file: str, expected_min: int) -> T
         )
     
     # Analyze the code
-    result = analyze_code(code, str(file_path), language)
-    
+    result = _analyze_cached(str(file_path), language)
+    return _language_result(language, file_path, code, result, expected_min)
+
+
+def _language_result(language: str, file_path: Path, code: str, result, expected_min: int) -> TestResult:
+    """Judge one analyzed fixture: detection, the issue count and the first findings as details."""
     # Check language detection
     detected = detect_language(code, str(file_path))
     
@@ -198,52 +232,73 @@ def run_fix_comments_check(language: str, fixture_file: str) -> bool:
     if language == 'json':
         return True
 
-    fixtures_dir = get_fixtures_dir()
-    file_path = fixtures_dir / fixture_file
+    file_path = _fixture_path(language, fixture_file)
     
     if not file_path.exists():
         return False
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            code = f.read()
+        result = _analyze_cached(str(file_path), language)
     except Exception:
         return False
     
-    result = analyze_code(code, str(file_path), language)
-    
-    if not result.fixes:
+    return _fix_comments_ok(language, result, add_fix_comments(result) if result.fixes else '')
+
+
+def _fix_comments_ok(language: str, result, fixed_with_comments: str) -> bool:
+    """Whether the commented fixed code of an analyzed fixture carries pactfix comments."""
+    if language == 'json' or not result.fixes:
         return True  # No fixes to test
     
-    fixed_with_comments = add_fix_comments(result)
-    
     # Check that pactfix comments were added
     return 'pactfix:' in fixed_with_comments
 
 
-@pytest.mark.parametrize(
-    "language,fixture_file,expected_min",
-    [
-        (language, fixture_file, EXPECTED_ISSUES.get(language, 3))
-        for language, fixture_file in FIXTURE_FILES.items()
-    ],
-)
-def test_language(language: str, fixture_file: str, expected_min: int) -> None:
-    result = run_language_check(language, fixture_file, expected_min)
+# The same matrix for pytest; a missing fixture is reported as skipped rather than failed
+_PYTEST_LANG_PARAMS = [
+    pytest.param(params, id=params[0],
+                 marks=() if _RESOLVED_PATHS[params[0]].exists() else pytest.mark.skip(reason=f"missing {params[1]}"))
+    for params in _LANG_PARAMS
+]
+
+
+@pytest.fixture(scope="session", params=_PYTEST_LANG_PARAMS)
+def language_fixture(request):
+    """One fixture per language, loaded, analyzed and commented once for every test that uses it."""
+    language, fixture_file, expected_min = request.param
+    path = _RESOLVED_PATHS[language]
+    result = _analyze_cached(str(path), language)
+    return SimpleNamespace(language=language, fixture_file=fixture_file, path=path,
+                           code=_read_fixture(str(path)), result=result,
+                           fixed_with_comments=add_fix_comments(result) if result.fixes else '',
+                           expected_min=expected_min)
+
+
+def test_language(language_fixture) -> None:
+    fx = language_fixture
+    result = _language_result(fx.language, fx.path, fx.code, fx.result, fx.expected_min)
     assert result.passed, "\n".join(result.details) if result.details else "Language check failed"
 
 
-@pytest.mark.parametrize(
-    "language,fixture_file",
-    [(language, fixture_file) for language, fixture_file in FIXTURE_FILES.items()],
-)
-def test_fix_comments(language: str, fixture_file: str) -> None:
-    assert run_fix_comments_check(language, fixture_file)
+def test_fix_comments(language_fixture) -> None:
+    fx = language_fixture
+    assert _fix_comments_ok(fx.language, fx.result, fx.fixed_with_comments), f"{fx.language}: no pactfix comments added"
 
 
-def run_all_tests(verbose: bool = True) -> TestSuiteResult:
-    """Run all tests and return results."""
-    start_time = datetime.now()
+def test_check_helpers_agree_with_fixture_data(language_fixture) -> None:
+    # The script entry point (main) goes through these helpers rather than the fixture
+    fx = language_fixture
+    assert run_language_check(fx.language, fx.fixture_file, fx.expected_min).passed
+    assert run_fix_comments_check(fx.language, fx.fixture_file)
+
+
+def _check_language(params) -> TestResult:
+    return run_language_check(*params)
+
+
+def run_all_tests(verbose: bool = True, jobs: int = 1) -> TestSuiteResult:
+    """Run all tests and return results (jobs > 1 or 0 = CPU count checks languages in worker processes)."""
+    start_time = time.perf_counter()
     results: List[TestResult] = []
     languages_tested = []
     
@@ -253,13 +308,18 @@ def run_all_tests(verbose: bool = True) -> TestSuiteResult:
     print("=" * 70)
     print()
     
-    for language, fixture_file in FIXTURE_FILES.items():
-        expected_min = EXPECTED_ISSUES.get(language, 3)
-        
+    pool = None
+    if jobs != 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(jobs or None)
+        checked = pool.imap(_check_language, _LANG_PARAMS)
+    else:
+        checked = map(_check_language, _LANG_PARAMS)
+    
+    for language, result in zip(FIXTURE_FILES, checked):
         if verbose:
             print(f"Testing {language}...", end=" ")
         
-        result = run_language_check(language, fixture_file, expected_min)
         results.append(result)
         languages_tested.append(language)
         
@@ -271,9 +331,12 @@ def run_all_tests(verbose: bool = True) -> TestSuiteResult:
                 for detail in result.details[:3]:
                     print(f"    {detail}")
     
+    if pool is not None:
+        pool.close()
+        pool.join()
+    
     # Calculate totals
-    end_time = datetime.now()
-    duration = (end_time - start_time).total_seconds()
+    duration = time.perf_counter() - start_time
     
     passed = sum(1 for r in results if r.passed)
     failed = len(results) - passed
@@ -358,6 +421,7 @@ def main():
     parser.add_argument('-q', '--quiet', action='store_true', help='Quiet output')
     parser.add_argument('--save-report', action='store_true', help='Save report to JSON')
     parser.add_argument('--language', help='Test specific language only')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Worker processes (0 = CPU count, 1 = serial)')
     
     args = parser.parse_args()
     
@@ -383,7 +447,7 @@ def main():
         
         return 0 if result.passed else 1
     
-    result = run_all_tests(verbose=verbose)
+    result = run_all_tests(verbose=verbose, jobs=args.jobs)
     
     if args.save_report:
         save_report(result)
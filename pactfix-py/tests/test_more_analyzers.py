@@ -6,6 +6,8 @@ from pactfix.analyzer import (
     analyze_github_actions,
     analyze_ansible,
 )
+from pactfix.analyzers.gitlab_ci import analyze_gitlab_ci
+from pactfix.analyzers.jenkinsfile import analyze_jenkinsfile
 
 
 class TestDockerComposeAnalysis:
@@ -33,6 +35,12 @@ services:
         assert any(e.code == 'COMPOSE005' for e in result.errors)
 
 
+    def test_non_mapping_yaml_is_invalid(self):
+        for code in ("another = test   \n\twith_tab = 1\n", "- web\n- db\n"):
+            result = analyze_docker_compose(code)
+            assert [e.code for e in result.errors] == ['COMPOSE999']
+            assert result.fixed_code == code
+
 class TestNginxAnalysis:
     def test_server_tokens_fix(self):
         result = analyze_nginx(
@@ -112,3 +120,29 @@ class TestAnsibleAnalysis:
 """
         )
         assert any(w.code == 'ANS004' for w in result.warnings)
+
+
+class TestGitlabCiImageFixes:
+    def test_image_line_is_rebuilt_without_quotes(self):
+        result = analyze_gitlab_ci('build:\n  image: "python:latest"')
+        assert result.fixed_code == 'build:\n  image: python:3.11'
+
+    def test_bare_latest_suffix_is_pinned(self):
+        result = analyze_gitlab_ci('image: foolatest')
+        assert any(w.code == 'GL003' for w in result.warnings)
+        assert result.fixed_code == 'image: foo1.0.0'
+
+    def test_secret_check_sees_the_original_image_line(self):
+        result = analyze_gitlab_ci('image: token')
+        assert result.fixed_code == 'image: token:1.0.0'
+        assert not any(e.code == 'GL005' for e in result.errors)
+
+
+class TestJenkinsfileImageFixes:
+    def test_bare_latest_suffix_is_not_flagged(self):
+        result = analyze_jenkinsfile("agent { docker { image 'repo:mylatest' } }\n")
+        assert not any(w.code == 'JEN003' for w in result.warnings)
+
+    def test_untagged_image_gets_default_tag(self):
+        result = analyze_jenkinsfile("agent { docker { image 'foolatest' } }")
+        assert result.fixed_code == "agent { docker { image 'foolatest:1.0.0' } }"